@@ -60,10 +60,12 @@ def get_major_cities():
             lon = request.args.get('lon', type=float)
             if lat is not None and lon is not None:
                 user_coords = Coordinates(lat, lon)
-                major_cities = sorted(
-                    major_cities,
-                    key=lambda x: user_coords.distance_to(x.coordinates)
-                )
+                distances = user_coords.distances_to([c.coordinates for c in major_cities])
+                major_cities = [
+                    city for _, city in sorted(
+                        zip(distances, major_cities), key=lambda x: x[0]
+                    )
+                ]
         
         # Limit results
         limit = request.args.get('limit', 50, type=int)
@@ -99,7 +101,7 @@ def get_location(code: str):
                 'error': f'Location {code} not found'
             }), 404
         
-        response = location.to_dict()
+        response = dict(location.to_dict())
         
         # Include secondary cities if it's a major city
         if location.tier == LocationTier.MAJOR_CITY:
@@ -35,6 +35,7 @@ class ScraperAPIManager:
     _sync_manager = None
     _sync_client = None
     _rate_limiter = None
+    _supabase_client = None
     
     def __new__(cls):
         if cls._instance is None:
@@ -62,6 +63,17 @@ class ScraperAPIManager:
     @property
     def rate_limiter(self):
         return self._rate_limiter
+    
+    @property
+    def supabase_client(self):
+        """Shared Supabase client, created on first use and reused across requests"""
+        if self._supabase_client is None:
+            from supabase import create_client
+            self._supabase_client = create_client(
+                os.environ.get('SUPABASE_URL'),
+                os.environ.get('SUPABASE_KEY')
+            )
+        return self._supabase_client
 
 
 def get_manager() -> ScraperAPIManager:
@@ -416,11 +428,7 @@ def rsvp_event():
         manager = get_manager()
         if manager.sync_client.is_configured():
             try:
-                from supabase import create_client
-                client = create_client(
-                    os.environ.get('SUPABASE_URL'),
-                    os.environ.get('SUPABASE_KEY')
-                )
+                client = manager.supabase_client
                 
                 # Insert RSVP record
                 client.table('rsvps').insert({
@@ -473,11 +481,7 @@ def cancel_rsvp(rsvp_id):
         
         if manager.sync_client.is_configured():
             try:
-                from supabase import create_client
-                client = create_client(
-                    os.environ.get('SUPABASE_URL'),
-                    os.environ.get('SUPABASE_KEY')
-                )
+                client = manager.supabase_client
                 
                 # Delete RSVP record
                 client.table('rsvps')\
@@ -524,11 +528,7 @@ def rsvp_status(event_id):
         
         if manager.sync_client.is_configured():
             try:
-                from supabase import create_client
-                client = create_client(
-                    os.environ.get('SUPABASE_URL'),
-                    os.environ.get('SUPABASE_KEY')
-                )
+                client = manager.supabase_client
                 
                 response = client.table('rsvps')\
                     .select('rsvp_id, user_name, user_email')\
@@ -598,11 +598,7 @@ def get_comments(event_id):
         
         if manager.sync_client.is_configured():
             try:
-                from supabase import create_client
-                client = create_client(
-                    os.environ.get('SUPABASE_URL'),
-                    os.environ.get('SUPABASE_KEY')
-                )
+                client = manager.supabase_client
                 
                 # Build query
                 query = client.table('comments')\
@@ -677,6 +673,15 @@ def post_comment():
     }
     """
     try:
+        # Get client identifier (IP address)
+        client_ip = request.remote_addr or 'unknown'
+        manager = get_manager()
+        
+        # Reject throttled clients before parsing or validating the body
+        is_allowed, rate_error = manager.rate_limiter.is_allowed(client_ip)
+        if not is_allowed:
+            return _rate_limited_response(rate_error)
+        
         data = request.get_json()
         
         if not data:
@@ -685,9 +690,6 @@ def post_comment():
                 'message': 'No data provided'
             }), 400
         
-        # Get client identifier (IP address)
-        client_ip = request.remote_addr or 'unknown'
-        
         # Validate data
         event_id = str(data.get('event_id', '')).strip()
         author_name = str(data.get('author_name', '')).strip()
@@ -708,18 +710,10 @@ def post_comment():
                 'message': error
             }), 400
         
-        # Check rate limiting
-        manager = get_manager()
-        is_allowed, rate_error = manager.rate_limiter.is_allowed(client_ip)
+        # Check and record rate limiting in one step
+        is_allowed, rate_error = manager.rate_limiter.try_acquire(client_ip)
         if not is_allowed:
-            return jsonify({
-                'success': False,
-                'message': rate_error,
-                'rate_limited': True
-            }), 429  # Too Many Requests
-        
-        # Record comment for rate limiting
-        manager.rate_limiter.record_comment(client_ip)
+            return _rate_limited_response(rate_error)
         
         # Sanitize comment
         text = CommentValidator.sanitize(text)
@@ -732,11 +726,7 @@ def post_comment():
         is_approved = True  # Can be changed to False for moderation
         if manager.sync_client.is_configured():
             try:
-                from supabase import create_client
-                client = create_client(
-                    os.environ.get('SUPABASE_URL'),
-                    os.environ.get('SUPABASE_KEY')
-                )
+                client = manager.supabase_client
                 
                 client.table('comments').insert({
                     'comment_id': comment_id,
@@ -784,11 +774,7 @@ def delete_comment(comment_id):
         
         if manager.sync_client.is_configured():
             try:
-                from supabase import create_client
-                client = create_client(
-                    os.environ.get('SUPABASE_URL'),
-                    os.environ.get('SUPABASE_KEY')
-                )
+                client = manager.supabase_client
                 
                 # Soft delete
                 client.table('comments')\
@@ -829,11 +815,7 @@ def like_comment(comment_id):
         
         if manager.sync_client.is_configured():
             try:
-                from supabase import create_client
-                client = create_client(
-                    os.environ.get('SUPABASE_URL'),
-                    os.environ.get('SUPABASE_KEY')
-                )
+                client = manager.supabase_client
                 
                 # Get current likes
                 response = client.table('comments')\
@@ -914,6 +896,17 @@ def rate_limit_status():
         }), 500
 
 
+# ===== COMMENT HELPER FUNCTIONS =====
+
+def _rate_limited_response(message):
+    """Build the 429 response returned to throttled commenters"""
+    return jsonify({
+        'success': False,
+        'message': message,
+        'rate_limited': True
+    }), 429  # Too Many Requests
+
+
 # ===== CALENDAR HELPER FUNCTIONS =====
 
 def _generate_google_calendar_url(title, date_str, time_str, location, description, reminder_minutes=120):
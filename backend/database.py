@@ -11,6 +11,7 @@ from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sess
 from sqlalchemy.orm import declarative_base, sessionmaker
 from sqlalchemy.pool import NullPool
 from datetime import datetime, date
+from typing import AsyncIterator, Tuple
 import os
 
 # Database URL from environment or default to PostgreSQL
@@ -171,12 +172,20 @@ async def save_events(events_data: list, city_id: str):
         saved_count = 0
         updated_count = 0
         
-        for event_data in events_data:
-            # Check if event already exists
+        # Load every already-stored event in a few IN queries instead of one
+        # SELECT per event (chunked to stay under the driver's parameter limit)
+        links = list({event_data.get('link') for event_data in events_data})
+        existing_by_link = {}
+        for start in range(0, len(links), 1000):
             existing = await session.execute(
-                select(Event).where(Event.link == event_data.get('link'))
+                select(Event).where(Event.link.in_(links[start:start + 1000]))
             )
-            existing_event = existing.scalar_one_or_none()
+            for event in existing.scalars():
+                existing_by_link[event.link] = event
+        
+        for event_data in events_data:
+            # Check if event already exists
+            existing_event = existing_by_link.get(event_data.get('link'))
             
             # Parse date
             event_date = event_data.get('date')
@@ -212,6 +221,8 @@ async def save_events(events_data: list, city_id: str):
                     city_id=city_id
                 )
                 session.add(new_event)
+                # Later duplicates of this link in the batch update it instead of inserting again
+                existing_by_link[new_event.link] = new_event
                 saved_count += 1
         
         await session.commit()
@@ -230,6 +241,64 @@ async def get_active_subscribers(city_id: str):
         )
         return result.scalars().all()
 
+async def iter_active_subscribers_by_city(city_ids: list, yield_per: int = 1000) -> AsyncIterator[Tuple[str, list]]:
+    """
+    Stream active subscribers for many cities in one query, a city at a time
+    
+    Rows come from a server-side cursor yield_per at a time, ordered by city,
+    and (city_id, subscribers) is yielded as soon as a city's last row has
+    arrived, so callers can start on one city while the next is still being
+    fetched. Subscribers are lightweight (id, email, city_id) rows rather than
+    full Subscription objects; cities without active subscribers are skipped.
+    """
+    from sqlalchemy import select
+    
+    async with AsyncSessionLocal() as session:
+        result = await session.stream(
+            select(Subscription.id, Subscription.email, Subscription.city_id).where(
+                Subscription.city_id.in_(city_ids),
+                Subscription.is_active == True
+            ).order_by(Subscription.city_id).execution_options(yield_per=yield_per)
+        )
+        city_id, subscribers = None, []
+        async for subscriber in result:
+            if subscriber.city_id != city_id:
+                if subscribers:
+                    yield city_id, subscribers
+                city_id, subscribers = subscriber.city_id, []
+            subscribers.append(subscriber)
+        if subscribers:
+            yield city_id, subscribers
+
+async def get_upcoming_events_by_city(city_ids: list, start: date, end: date, per_city_limit: int = 20) -> dict:
+    """
+    Get the earliest events between start and end for many cities in one query
+    
+    Returns rows of (title, date, time, location) keyed by city_id, at most
+    per_city_limit per city, ordered by date.
+    """
+    from sqlalchemy import select, func
+    
+    ranked = select(
+        Event.city_id, Event.title, Event.date, Event.time, Event.location,
+        func.row_number().over(partition_by=Event.city_id, order_by=Event.date).label('rank')
+    ).where(
+        Event.city_id.in_(city_ids),
+        Event.date >= start,
+        Event.date <= end
+    ).subquery()
+    
+    events_by_city = {city_id: [] for city_id in city_ids}
+    async with AsyncSessionLocal() as session:
+        result = await session.execute(
+            select(ranked.c.city_id, ranked.c.title, ranked.c.date, ranked.c.time, ranked.c.location)
+            .where(ranked.c.rank <= per_city_limit)
+            .order_by(ranked.c.city_id, ranked.c.date)
+        )
+        for row in result:
+            events_by_city[row.city_id].append(row)
+    return events_by_city
+
 async def log_email_sent(subscription_id: int, email: str, city_id: str, events_count: int, success: bool = True, error_message: str = None):
     """Log an email sent event"""
     async with AsyncSessionLocal() as session:
@@ -244,3 +313,18 @@ async def log_email_sent(subscription_id: int, email: str, city_id: str, events_
         )
         session.add(log_entry)
         await session.commit()
+
+async def log_email_sent_bulk(entries: list):
+    """
+    Log many email sends in one transaction
+    
+    Each entry is a dict of EmailLog fields (subscription_id, email, city_id,
+    events_count, success, error_message, sent_at); sent_at defaults to now.
+    """
+    if not entries:
+        return
+    
+    sent_at = datetime.utcnow()
+    async with AsyncSessionLocal() as session:
+        session.add_all([EmailLog(**{'sent_at': sent_at, **entry}) for entry in entries])
+        await session.commit()
@@ -8,10 +8,15 @@ import os
 import smtplib
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
-from typing import Optional
+from typing import Callable, List, Optional, Union
 import aiohttp
 import asyncio
 import html
+import time
+import random
+import logging
+
+logger = logging.getLogger(__name__)
 
 # Email configuration
 SMTP_HOST = os.environ.get("SMTP_HOST", "smtp.gmail.com")
@@ -19,37 +24,25 @@ SMTP_PORT = int(os.environ.get("SMTP_PORT", 587))
 SMTP_USER = os.environ.get("SMTP_USER", "")
 SMTP_PASSWORD = os.environ.get("SMTP_PASSWORD", "")
 SMTP_FROM = os.environ.get("SMTP_FROM", "noreply@nocturne.events")
+SMTP_TIMEOUT = 30  # seconds
+
+# Messages sent over one persistent SMTP connection before it is recycled
+SMTP_MAX_MESSAGES_PER_CONNECTION = 100
+
+# Temporary SMTP failures (service unavailable, mailbox busy, local error,
+# insufficient storage, TLS unavailable) worth retrying with backoff
+SMTP_TRANSIENT_CODES = frozenset({421, 450, 451, 452, 454})
+SMTP_SEND_ATTEMPTS = 3
+
+# Sustained bulk send rate (emails per second) for digests
+EMAIL_SEND_RATE = float(os.environ.get("EMAIL_SEND_RATE", 10))
 
 # SendGrid configuration (alternative to SMTP)
 SENDGRID_API_KEY = os.environ.get("SENDGRID_API_KEY", "")
 SENDGRID_FROM_EMAIL = os.environ.get("SENDGRID_FROM_EMAIL", "noreply@nocturne.events")
 
-# Email template
-def generate_email_template(city_name: str, events: list) -> str:
-    """
-    Generate HTML email template for weekly digest
-    """
-    events_html = ""
-    
-    for event in events:
-        title = html.escape(event.get('title', 'Unknown Event'))
-        date_val = html.escape(str(event.get('date', 'TBA')))
-        time_val = html.escape(event.get('time', 'TBA'))
-        location = html.escape(event.get('location', 'Location TBA'))
-        
-        desc = event.get('description', '')
-        if len(desc) > 200:
-            truncated = html.escape(desc[:200]) + "..."
-        else:
-            truncated = html.escape(desc)
-        
-        link = event.get('link')
-        link_html = ''
-        if link:
-            escaped_link = html.escape(link)
-            link_html = f'<a href="{escaped_link}" style="color: #ccff00; text-decoration: none; font-weight: bold;">VIEW EVENT →</a>'
-        
-        events_html += f"""
+# Email templates (static layout of the weekly digest, filled in with str.format)
+EMAIL_EVENT_TEMPLATE = """
         <div style="border-left: 3px solid #ccff00; padding-left: 15px; margin-bottom: 20px;">
             <h3 style="margin: 0 0 5px 0; color: #ffffff; font-size: 18px;">{title}</h3>
             <p style="margin: 5px 0; color: #a1a1aa; font-size: 14px;">
@@ -64,8 +57,8 @@ def generate_email_template(city_name: str, events: list) -> str:
             {link_html}
         </div>
         """
-    
-    html_template = f"""
+
+EMAIL_DIGEST_TEMPLATE = """
     <!DOCTYPE html>
     <html>
     <head>
@@ -136,20 +129,270 @@ def generate_email_template(city_name: str, events: list) -> str:
     </body>
     </html>
     """
+
+
+def generate_email_template(city_name: str, events: list) -> str:
+    """
+    Generate HTML email template for weekly digest
+    """
+    event_parts = []
+    
+    for event in events:
+        title = html.escape(event.get('title', 'Unknown Event'))
+        date_val = html.escape(str(event.get('date', 'TBA')))
+        time_val = html.escape(event.get('time', 'TBA'))
+        location = html.escape(event.get('location', 'Location TBA'))
+        
+        desc = event.get('description', '')
+        if len(desc) > 200:
+            truncated = html.escape(desc[:200]) + "..."
+        else:
+            truncated = html.escape(desc)
+        
+        link = event.get('link')
+        link_html = ''
+        if link:
+            escaped_link = html.escape(link)
+            link_html = f'<a href="{escaped_link}" style="color: #ccff00; text-decoration: none; font-weight: bold;">VIEW EVENT →</a>'
+        
+        event_parts.append(EMAIL_EVENT_TEMPLATE.format(
+            title=title,
+            date_val=date_val,
+            time_val=time_val,
+            location=location,
+            truncated=truncated,
+            link_html=link_html
+        ))
+    
+    return EMAIL_DIGEST_TEMPLATE.format(city_name=city_name, events_html="".join(event_parts))
+
+
+def _is_transient_smtp_error(error: smtplib.SMTPException) -> bool:
+    """Whether an SMTP failure is temporary and the send may succeed if retried"""
+    if isinstance(error, smtplib.SMTPRecipientsRefused):
+        codes = [code for code, _ in error.recipients.values()]
+    else:
+        codes = [getattr(error, 'smtp_code', None)]
+    return bool(codes) and all(code in SMTP_TRANSIENT_CODES for code in codes)
+
+
+class SMTPConnection:
+    """
+    Persistent SMTP connection for sending many emails
+    
+    Connects, upgrades to TLS and logs in on first use, then reuses the session
+    for later messages instead of paying that handshake per email. Reconnects if
+    the server drops the connection, recycles it every max_messages sends and
+    retries sends that fail with a transient SMTP code, backing off between
+    attempts. smtplib is blocking, so all I/O runs in a worker thread; sends
+    over one connection are serialized.
+    
+    Usage:
+        async with SMTPConnection() as smtp:
+            await send_email(to_email, subject, html_content, smtp=smtp)
+    """
     
-    return html_template
+    def __init__(self, max_messages: int = SMTP_MAX_MESSAGES_PER_CONNECTION):
+        self.max_messages = max_messages
+        self._server: Optional[smtplib.SMTP] = None
+        self._sent = 0
+        self._lock = asyncio.Lock()
+    
+    def _connect(self) -> None:
+        server = smtplib.SMTP(SMTP_HOST, SMTP_PORT, timeout=SMTP_TIMEOUT)
+        server.starttls()
+        server.login(SMTP_USER, SMTP_PASSWORD)
+        self._server = server
+        self._sent = 0
+    
+    def _disconnect(self) -> None:
+        if self._server is None:
+            return
+        try:
+            self._server.quit()
+        except (smtplib.SMTPException, OSError):
+            pass
+        self._server = None
+    
+    def _send_sync(self, send: Callable[[smtplib.SMTP], object]) -> None:
+        if self._server is None or self._sent >= self.max_messages:
+            self._disconnect()
+            self._connect()
+        try:
+            send(self._server)
+        except smtplib.SMTPServerDisconnected:
+            # Idle connections get dropped by the server; reconnect once and retry
+            self._disconnect()
+            self._connect()
+            send(self._server)
+        self._sent += 1
+    
+    async def _send(self, send: Callable[[smtplib.SMTP], object]) -> None:
+        for attempt in range(1, SMTP_SEND_ATTEMPTS + 1):
+            try:
+                async with self._lock:
+                    await asyncio.to_thread(self._send_sync, send)
+                return
+            except smtplib.SMTPException as e:
+                if attempt == SMTP_SEND_ATTEMPTS or not _is_transient_smtp_error(e):
+                    raise
+                # Back off (1s, 2s, ... plus jitter) without holding the connection lock
+                await asyncio.sleep(2 ** (attempt - 1) + random.random())
+    
+    async def send_message(self, msg) -> None:
+        """Send a prepared email message over this connection"""
+        await self._send(lambda server: server.send_message(msg))
+    
+    async def sendmail(self, from_addr: str, to_addrs: List[str], data: bytes) -> None:
+        """Send an already serialized message to the given envelope recipients"""
+        await self._send(lambda server: server.sendmail(from_addr, to_addrs, data))
+    
+    async def close(self) -> None:
+        """Close the underlying connection, if open"""
+        async with self._lock:
+            await asyncio.to_thread(self._disconnect)
+    
+    async def __aenter__(self) -> "SMTPConnection":
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.close()
+
+
+class SendRateLimiter:
+    """
+    Token-bucket limiter for bulk email sends
+    
+    Tokens refill continuously at `rate` per second up to `rate` tokens (at
+    least one, so rates below 1/s still send), so each send waits only as
+    long as needed to hold the average rate instead of whole batches sleeping
+    behind the slowest email.
+    
+    Usage:
+        limiter = SendRateLimiter(rate=10)
+        async with limiter:
+            await send_email(to_email, subject, html_content)
+    """
+    
+    def __init__(self, rate: float = EMAIL_SEND_RATE):
+        if rate <= 0:
+            raise ValueError(f"Email send rate must be positive, got {rate}")
+        self.rate = rate
+        self.capacity = max(1.0, rate)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+    
+    async def acquire(self) -> None:
+        """Wait until a send token is available and take it"""
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+    
+    async def __aenter__(self) -> "SendRateLimiter":
+        await self.acquire()
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        pass
+
+
+class SMTPConnectionPool:
+    """
+    Fixed-size pool of persistent SMTP connections shared by concurrent senders
+    
+    Each send borrows an idle SMTPConnection, so up to `size` emails go out in
+    parallel while each connection still logs in only once per
+    max_messages sends. Connections open lazily on first use.
+    
+    Usage:
+        async with SMTPConnectionPool(size=10) as smtp:
+            await send_email(to_email, subject, html_content, smtp=smtp)
+    """
+    
+    def __init__(self, size: int, max_messages: int = SMTP_MAX_MESSAGES_PER_CONNECTION):
+        self._connections = [SMTPConnection(max_messages) for _ in range(size)]
+        self._idle: asyncio.Queue = asyncio.Queue()
+        for connection in self._connections:
+            self._idle.put_nowait(connection)
+    
+    async def send_message(self, msg) -> None:
+        """Send a prepared email message over the next idle connection"""
+        connection = await self._idle.get()
+        try:
+            await connection.send_message(msg)
+        finally:
+            self._idle.put_nowait(connection)
+    
+    async def sendmail(self, from_addr: str, to_addrs: List[str], data: bytes) -> None:
+        """Send an already serialized message over the next idle connection"""
+        connection = await self._idle.get()
+        try:
+            await connection.sendmail(from_addr, to_addrs, data)
+        finally:
+            self._idle.put_nowait(connection)
+    
+    async def close(self) -> None:
+        """Close every connection in the pool"""
+        await asyncio.gather(*(connection.close() for connection in self._connections))
+    
+    async def __aenter__(self) -> "SMTPConnectionPool":
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.close()
+
+
+class PreparedEmail:
+    """
+    Email built and serialized once, then sent to many recipients
+    
+    Only the To header differs between recipients of a bulk send, so it is
+    prepended to the pre-encoded message instead of rebuilding and
+    re-encoding the MIME tree for every email.
+    
+    Usage:
+        prepared = PreparedEmail(subject, html_content)
+        await send_prepared_email(to_email, prepared, smtp)
+    """
+    
+    def __init__(self, subject: str, html_content: str):
+        self.subject = subject
+        self.html_content = html_content
+        
+        msg = MIMEMultipart('alternative')
+        msg['From'] = SMTP_FROM
+        msg['Subject'] = subject
+        msg.attach(MIMEText(html_content, 'html'))
+        self._data = msg.as_bytes(policy=msg.policy.clone(linesep='\r\n'))
+    
+    def for_recipient(self, to_email: str) -> bytes:
+        """Return the serialized message addressed to to_email"""
+        if '\r' in to_email or '\n' in to_email:
+            raise ValueError(f"Invalid email address: {to_email!r}")
+        return b"To: " + to_email.encode('ascii') + b"\r\n" + self._data
 
 
 async def send_email_via_smtp(
     to_email: str,
     subject: str,
-    html_content: str
+    html_content: str,
+    smtp: Optional[Union[SMTPConnection, SMTPConnectionPool]] = None
 ) -> bool:
     """
     Send email using SMTP
+    
+    Uses the given persistent connection or pool when provided, otherwise
+    opens a connection just for this email.
     """
     if not SMTP_USER or not SMTP_PASSWORD:
-        print("SMTP credentials not configured, skipping email send")
+        logger.warning("SMTP credentials not configured, skipping email send")
         return False
     
     try:
@@ -161,6 +404,10 @@ async def send_email_via_smtp(
         # Attach HTML content
         msg.attach(MIMEText(html_content, 'html'))
         
+        if smtp is not None:
+            await smtp.send_message(msg)
+            return True
+        
         # Send email (in a thread pool to avoid blocking)
         def _send_sync():
             with smtplib.SMTP(SMTP_HOST, SMTP_PORT) as server:
@@ -175,7 +422,7 @@ async def send_email_via_smtp(
         return True
         
     except Exception as e:
-        print(f"Error sending email via SMTP: {e}")
+        logger.error(f"Error sending email via SMTP: {e}")
         return False
 
 
@@ -188,7 +435,7 @@ async def send_email_via_sendgrid(
     Send email using SendGrid API
     """
     if not SENDGRID_API_KEY:
-        print("SendGrid API key not configured, skipping email send")
+        logger.warning("SendGrid API key not configured, skipping email send")
         return False
     
     try:
@@ -220,11 +467,11 @@ async def send_email_via_sendgrid(
                     return True
                 else:
                     error_text = await response.text()
-                    print(f"SendGrid error: {response.status} - {error_text}")
+                    logger.error(f"SendGrid error: {response.status} - {error_text}")
                     return False
                     
     except Exception as e:
-        print(f"Error sending email via SendGrid: {e}")
+        logger.error(f"Error sending email via SendGrid: {e}")
         return False
 
 
@@ -232,7 +479,8 @@ async def send_email(
     to_email: str,
     subject: str,
     html_content: str,
-    prefer_sendgrid: bool = False
+    prefer_sendgrid: bool = False,
+    smtp: Optional[Union[SMTPConnection, SMTPConnectionPool]] = None
 ) -> bool:
     """
     Send email using the best available method
@@ -242,6 +490,7 @@ async def send_email(
         subject: Email subject
         html_content: HTML content of the email
         prefer_sendgrid: If True, try SendGrid first, otherwise try SMTP first
+        smtp: Optional persistent SMTP connection or pool to reuse for bulk sends
     
     Returns:
         True if email sent successfully, False otherwise
@@ -252,9 +501,9 @@ async def send_email(
         if success:
             return True
         # Fallback to SMTP
-        return await send_email_via_smtp(to_email, subject, html_content)
+        return await send_email_via_smtp(to_email, subject, html_content, smtp)
     elif SMTP_USER and SMTP_PASSWORD:
-        success = await send_email_via_smtp(to_email, subject, html_content)
+        success = await send_email_via_smtp(to_email, subject, html_content, smtp)
         if success:
             return True
         # Fallback to SendGrid
@@ -262,7 +511,36 @@ async def send_email(
     elif SENDGRID_API_KEY:
         return await send_email_via_sendgrid(to_email, subject, html_content)
     else:
-        print("No email service configured (SMTP or SendGrid)")
+        logger.error("No email service configured (SMTP or SendGrid)")
+        return False
+
+
+async def send_prepared_email(
+    to_email: str,
+    prepared: PreparedEmail,
+    smtp: Union[SMTPConnection, SMTPConnectionPool]
+) -> bool:
+    """
+    Send a PreparedEmail over a persistent SMTP connection or pool
+    
+    Falls back to SendGrid with the same subject and content when the SMTP
+    send fails, like send_email.
+    
+    Returns:
+        True if email sent successfully, False otherwise
+    """
+    if SMTP_USER and SMTP_PASSWORD:
+        try:
+            await smtp.sendmail(SMTP_FROM, [to_email], prepared.for_recipient(to_email))
+            return True
+        except Exception as e:
+            logger.error(f"Error sending email via SMTP: {e}")
+        # Fallback to SendGrid
+        return await send_email_via_sendgrid(to_email, prepared.subject, prepared.html_content)
+    elif SENDGRID_API_KEY:
+        return await send_email_via_sendgrid(to_email, prepared.subject, prepared.html_content)
+    else:
+        logger.error("No email service configured (SMTP or SendGrid)")
         return False
 
 
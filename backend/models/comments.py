@@ -3,10 +3,11 @@ Comment system model and rate limiter
 Handles event comments with anti-spam rate limiting
 """
 
+import threading
 import time
 from datetime import datetime, timedelta
-from typing import Dict, List, Tuple, Optional
-from collections import defaultdict
+from typing import Deque, Dict, List, Tuple, Optional
+from collections import defaultdict, deque
 
 
 class RateLimiter:
@@ -23,15 +24,25 @@ class RateLimiter:
         self,
         max_per_minute: int = 3,
         max_per_hour: int = 20,
-        max_per_day: int = 100
+        max_per_day: int = 100,
+        max_identifiers: int = 10000
     ):
         self.max_per_minute = max_per_minute
         self.max_per_hour = max_per_hour
         self.max_per_day = max_per_day
+        # Cap on tracked IPs/users so a flood of distinct clients can't grow memory unbounded
+        self.max_identifiers = max_identifiers
         
-        # Track comment timestamps by IP/user
-        # Format: {ip_or_user: [timestamp1, timestamp2, ...]}
-        self.comment_history: Dict[str, List[float]] = defaultdict(list)
+        # Track comment timestamps by IP/user, oldest first
+        # Timestamps come from time.monotonic() so wall-clock jumps can't
+        # lock identifiers out or reopen their windows early
+        # Format: {ip_or_user: deque([timestamp1, timestamp2, ...])}
+        # Bounded by the daily limit: older entries can never change the outcome
+        self.comment_history: Dict[str, Deque[float]] = defaultdict(
+            lambda: deque(maxlen=self.max_per_day)
+        )
+        # Guards check-then-record so concurrent requests can't both slip under a limit
+        self._lock = threading.RLock()
     
     def is_allowed(self, identifier: str) -> Tuple[bool, Optional[str]]:
         """
@@ -43,33 +54,36 @@ class RateLimiter:
         Returns:
             (is_allowed, reason_if_blocked)
         """
-        now = time.time()
+        with self._lock:
+            return self._check(identifier, time.monotonic())
+    
+    def _check(self, identifier: str, now: float) -> Tuple[bool, Optional[str]]:
+        """Evaluate limits for identifier at time now (caller holds the lock)"""
+        timestamps = self.comment_history.get(identifier)
+        if not timestamps:
+            return True, None
         
-        # Clean old entries (older than 24 hours)
+        # Drop expired entries (older than 24 hours) from the front
         cutoff_time = now - (86400)  # 24 hours in seconds
-        self.comment_history[identifier] = [
-            ts for ts in self.comment_history[identifier]
-            if ts > cutoff_time
-        ]
+        while timestamps and timestamps[0] <= cutoff_time:
+            timestamps.popleft()
+        if not timestamps:
+            del self.comment_history[identifier]
+            return True, None
         
-        timestamps = self.comment_history[identifier]
+        # Timestamps are appended in order, so the window holds at least N
+        # entries exactly when the N-th newest entry falls inside it
         
         # Check per-minute limit
-        recent_minute = [
-            ts for ts in timestamps
-            if ts > (now - 60)  # Last 60 seconds
-        ]
-        if len(recent_minute) >= self.max_per_minute:
-            wait_time = int(60 - (now - recent_minute[0])) + 1
+        if (len(timestamps) >= self.max_per_minute
+                and timestamps[-self.max_per_minute] > now - 60):  # Last 60 seconds
+            wait_time = int(60 - (now - timestamps[-self.max_per_minute])) + 1
             return False, f"Too many comments. Please wait {wait_time} seconds."
         
         # Check per-hour limit
-        recent_hour = [
-            ts for ts in timestamps
-            if ts > (now - 3600)  # Last 3600 seconds (1 hour)
-        ]
-        if len(recent_hour) >= self.max_per_hour:
-            wait_time = int(3600 - (now - recent_hour[0])) + 1
+        if (len(timestamps) >= self.max_per_hour
+                and timestamps[-self.max_per_hour] > now - 3600):  # Last 3600 seconds (1 hour)
+            wait_time = int(3600 - (now - timestamps[-self.max_per_hour])) + 1
             return False, f"Hourly limit reached. Try again in {wait_time // 60} minutes."
         
         # Check per-day limit
@@ -80,20 +94,75 @@ class RateLimiter:
     
     def record_comment(self, identifier: str) -> None:
         """Record a comment for rate limiting"""
-        self.comment_history[identifier].append(time.time())
+        with self._lock:
+            self._record(identifier, time.monotonic())
+    
+    def _record(self, identifier: str, now: float) -> None:
+        """Append a timestamp for identifier (caller holds the lock)"""
+        if (identifier not in self.comment_history
+                and len(self.comment_history) >= self.max_identifiers):
+            self._prune(now)
+        self.comment_history[identifier].append(now)
+    
+    def _prune(self, now: float) -> None:
+        """
+        Free room for a new identifier (caller holds the lock)
+        
+        Drops identifiers with no comments in the last 24 hours first. If
+        the table is still full, evicts the tenth that commented least recently.
+        """
+        cutoff_time = now - 86400
+        history = self.comment_history
+        for identifier in [i for i, ts in history.items() if not ts or ts[-1] <= cutoff_time]:
+            del history[identifier]
+        
+        if len(history) >= self.max_identifiers:
+            by_last_seen = sorted(history, key=lambda i: history[i][-1])
+            for identifier in by_last_seen[:max(1, len(by_last_seen) // 10)]:
+                del history[identifier]
+    
+    def try_acquire(self, identifier: str) -> Tuple[bool, Optional[str]]:
+        """
+        Atomically check limits and record a comment if allowed
+        
+        Equivalent to is_allowed() followed by record_comment(), without
+        a window between the two for a concurrent request to slip through.
+        
+        Args:
+            identifier: IP address or user ID
+        
+        Returns:
+            (is_allowed, reason_if_blocked)
+        """
+        with self._lock:
+            now = time.monotonic()
+            allowed, reason = self._check(identifier, now)
+            if allowed:
+                self._record(identifier, now)
+            return allowed, reason
     
     def get_stats(self, identifier: str) -> Dict:
         """Get rate limit stats for an identifier"""
-        now = time.time()
-        timestamps = self.comment_history.get(identifier, [])
-        
-        recent_minute = [ts for ts in timestamps if ts > (now - 60)]
-        recent_hour = [ts for ts in timestamps if ts > (now - 3600)]
+        with self._lock:
+            now = time.monotonic()
+            timestamps = self.comment_history.get(identifier, ())
+            
+            # Single pass from newest to oldest; stops at the first entry past 24h
+            minute_cutoff, hour_cutoff, day_cutoff = now - 60, now - 3600, now - 86400
+            this_minute = this_hour = today = 0
+            for ts in reversed(timestamps):
+                if ts <= day_cutoff:
+                    break
+                today += 1
+                if ts > hour_cutoff:
+                    this_hour += 1
+                    if ts > minute_cutoff:
+                        this_minute += 1
         
         return {
-            'comments_this_minute': len(recent_minute),
-            'comments_this_hour': len(recent_hour),
-            'comments_today': len(timestamps),
+            'comments_this_minute': this_minute,
+            'comments_this_hour': this_hour,
+            'comments_today': today,
             'limit_per_minute': self.max_per_minute,
             'limit_per_hour': self.max_per_hour,
             'limit_per_day': self.max_per_day,
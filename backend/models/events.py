@@ -9,6 +9,7 @@ Supports:
 - User events vs scraped events
 """
 
+from collections import defaultdict
 from dataclasses import dataclass, field
 from typing import Optional, List, Dict, Any
 from enum import Enum
@@ -525,29 +526,21 @@ class EventStore:
                 'by_price_tier': {}
             }
         
-        stats = {
-            'total': len(self.events),
-            'by_source': {},
-            'by_category': {},
-            'by_price_tier': {},
-            'by_quality_tier': {}
-        }
+        by_source = defaultdict(int)
+        by_category = defaultdict(int)
+        by_price_tier = defaultdict(int)
+        by_quality_tier = defaultdict(int)
         
         for event in self.events.values():
-            # Source stats
-            source = event.source.value
-            stats['by_source'][source] = stats['by_source'].get(source, 0) + 1
-            
-            # Category stats
-            category = event.tags.category.value
-            stats['by_category'][category] = stats['by_category'].get(category, 0) + 1
-            
-            # Price tier stats
-            price_tier = event.tags.price_tier.value
-            stats['by_price_tier'][str(price_tier)] = stats['by_price_tier'].get(str(price_tier), 0) + 1
-            
-            # Quality tier stats
-            quality = event.quality_tier.value
-            stats['by_quality_tier'][quality] = stats['by_quality_tier'].get(quality, 0) + 1
+            by_source[event.source.value] += 1
+            by_category[event.tags.category.value] += 1
+            by_price_tier[str(event.tags.price_tier.value)] += 1
+            by_quality_tier[event.quality_tier.value] += 1
         
-        return stats
+        return {
+            'total': len(self.events),
+            'by_source': dict(by_source),
+            'by_category': dict(by_category),
+            'by_price_tier': dict(by_price_tier),
+            'by_quality_tier': dict(by_quality_tier)
+        }
@@ -9,12 +9,18 @@ Provides hierarchical location structure with:
 - Proximity-based queries
 """
 
-from dataclasses import dataclass
+from array import array
+from collections import defaultdict
+from dataclasses import dataclass, field, replace
 from typing import List, Optional, Tuple
 from enum import Enum
+import heapq
 import math
 
 
+EARTH_RADIUS_MILES = 3959.0
+
+
 class LocationTier(Enum):
     """Location hierarchy tiers"""
     MAJOR_CITY = "major"
@@ -23,11 +29,25 @@ class LocationTier(Enum):
     REGION = "region"
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class Coordinates:
-    """Geographic coordinates"""
+    """
+    Geographic coordinates
+
+    Immutable; radians and cos(latitude) are computed once on construction
+    so distance calculations don't repeat the conversion.
+    """
     latitude: float
     longitude: float
+    _lat_rad: float = field(init=False, repr=False, compare=False)
+    _lon_rad: float = field(init=False, repr=False, compare=False)
+    _cos_lat: float = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        lat_rad = math.radians(self.latitude)
+        object.__setattr__(self, '_lat_rad', lat_rad)
+        object.__setattr__(self, '_lon_rad', math.radians(self.longitude))
+        object.__setattr__(self, '_cos_lat', math.cos(lat_rad))
 
     def distance_to(self, other: 'Coordinates') -> float:
         """
@@ -39,19 +59,43 @@ class Coordinates:
         Returns:
             Distance in miles
         """
-        R = 3959  # Earth's radius in miles
+        R = EARTH_RADIUS_MILES
         
-        lat1, lon1 = math.radians(self.latitude), math.radians(self.longitude)
-        lat2, lon2 = math.radians(other.latitude), math.radians(other.longitude)
+        dlat = other._lat_rad - self._lat_rad
+        dlon = other._lon_rad - self._lon_rad
         
-        dlat = lat2 - lat1
-        dlon = lon2 - lon1
-        
-        a = math.sin(dlat / 2) ** 2 + math.cos(lat1) * math.cos(lat2) * math.sin(dlon / 2) ** 2
+        s_lat = math.sin(dlat * 0.5)
+        s_lon = math.sin(dlon * 0.5)
+        a = s_lat * s_lat + self._cos_lat * other._cos_lat * s_lon * s_lon
         c = 2 * math.asin(math.sqrt(a))
         
         return R * c
 
+    def distances_to(self, others: List['Coordinates']) -> List[float]:
+        """
+        Calculate distances to many coordinates in one pass (Haversine formula)
+        
+        Equivalent to ``[self.distance_to(o) for o in others]`` but hoists the
+        per-origin terms and function lookups out of the loop.
+        
+        Args:
+            others: Coordinates to measure to
+            
+        Returns:
+            Distances in miles, in the same order as ``others``
+        """
+        sin, asin, sqrt = math.sin, math.asin, math.sqrt
+        lat0, lon0, cos_lat0 = self._lat_rad, self._lon_rad, self._cos_lat
+        diameter = 2 * EARTH_RADIUS_MILES
+        
+        distances = []
+        for other in others:
+            s_lat = sin((other._lat_rad - lat0) * 0.5)
+            s_lon = sin((other._lon_rad - lon0) * 0.5)
+            a = s_lat * s_lat + cos_lat0 * other._cos_lat * s_lon * s_lon
+            distances.append(diameter * asin(sqrt(a)))
+        return distances
+
     def to_dict(self) -> dict:
         """Serialize to dictionary"""
         return {
@@ -65,7 +109,7 @@ class Coordinates:
         return Coordinates(data['latitude'], data['longitude'])
 
 
-@dataclass
+@dataclass(slots=True)
 class Location:
     """
     Represents a geographic location
@@ -92,10 +136,28 @@ class Location:
     population: Optional[int] = None
     parent_city: Optional[str] = None  # Reference to major city
     timezone: Optional[str] = None
-    metadata: Optional[dict] = None
+    metadata: dict = field(default_factory=dict)
+    _cached_dict: Optional[dict] = field(default=None, init=False, repr=False, compare=False)
+
+    def __setattr__(self, name, value):
+        # Any field assignment invalidates the cached to_dict() payload
+        object.__setattr__(self, name, value)
+        if name != '_cached_dict':
+            object.__setattr__(self, '_cached_dict', None)
 
     def to_dict(self) -> dict:
-        """Serialize to dictionary"""
+        """
+        Serialize to dictionary
+        
+        The result is cached until a field is reassigned and is shared
+        between callers; copy it before mutating.
+        """
+        if self._cached_dict is None:
+            self._cached_dict = self._build_dict()
+        return self._cached_dict
+
+    def _build_dict(self) -> dict:
+        """Build the serialized dictionary"""
         return {
             'id': self.id,
             'code': self.code,
@@ -107,7 +169,7 @@ class Location:
             'population': self.population,
             'parent_city': self.parent_city,
             'timezone': self.timezone,
-            'metadata': self.metadata or {}
+            'metadata': self.metadata
         }
 
     @staticmethod
@@ -124,11 +186,11 @@ class Location:
             population=data.get('population'),
             parent_city=data.get('parent_city'),
             timezone=data.get('timezone'),
-            metadata=data.get('metadata', {})
+            metadata=data.get('metadata') or {}
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class LocationPreference:
     """
     User's location preference/profile
@@ -160,6 +222,281 @@ class LocationPreference:
         }
 
 
+def _unit_vector(coordinates: Coordinates) -> Tuple[float, float, float]:
+    """Project coordinates onto the unit sphere"""
+    cos_lat, lon = coordinates._cos_lat, coordinates._lon_rad
+    return (cos_lat * math.cos(lon), cos_lat * math.sin(lon), math.sin(coordinates._lat_rad))
+
+
+def _chord_to_miles(chord: float) -> float:
+    """Convert a unit-sphere chord length to great-circle miles"""
+    return 2 * EARTH_RADIUS_MILES * math.asin(min(1.0, chord * 0.5))
+
+
+def _miles_to_chord(miles: float) -> float:
+    """Convert great-circle miles to a unit-sphere chord length"""
+    if miles >= math.pi * EARTH_RADIUS_MILES:
+        return 2.0
+    return 2 * math.sin(miles / (2 * EARTH_RADIUS_MILES))
+
+
+class SpatialIndex:
+    """
+    Static KD-tree over locations for nearest-neighbour and radius queries
+
+    Coordinates are stored as 3D unit-sphere vectors, so Euclidean (chord)
+    distance is monotonic in great-circle distance and no trig is needed
+    while walking the tree. Only returned results are converted to miles.
+
+    Every node covers a contiguous slice of ``_order`` and carries the
+    bounding box of its points, so radius queries can drop a subtree whose
+    box lies outside the search ball, or take it wholesale when the box
+    lies fully inside, without testing individual points.
+
+    Point i is stored as ``_xyz[3*i:3*i+3]`` in one packed float64 array
+    rather than as per-location tuples.
+    """
+
+    LEAF_SIZE = 8
+
+    def __init__(self, locations: List[Location]):
+        """
+        Build the index
+
+        Args:
+            locations: Locations to index
+        """
+        self._locations = list(locations)
+        self._xyz = array('d')
+        for loc in self._locations:
+            self._xyz.extend(_unit_vector(loc.coordinates))
+        self._order = list(range(len(self._locations)))
+        self._root = self._build(0, len(self._order)) if self._locations else None
+
+    def __len__(self) -> int:
+        return len(self._locations)
+
+    def _build(self, start: int, end: int) -> tuple:
+        """
+        Recursively build the node covering ``_order[start:end]``
+
+        Nodes are ``(start, end, lo, hi, axis, split, left, right)`` tuples;
+        leaves have ``left`` and ``right`` set to None.
+        """
+        xyz = self._xyz
+        members = self._order[start:end]
+        lo = tuple(min(xyz[3 * i + d] for i in members) for d in range(3))
+        hi = tuple(max(xyz[3 * i + d] for i in members) for d in range(3))
+
+        if end - start <= self.LEAF_SIZE:
+            return (start, end, lo, hi, 0, 0.0, None, None)
+
+        # Split on the widest axis of the node's box
+        axis = max(range(3), key=lambda d: hi[d] - lo[d])
+        members.sort(key=lambda i: xyz[3 * i + axis])
+        self._order[start:end] = members
+        mid = (start + end) // 2
+
+        return (
+            start, end, lo, hi,
+            axis, xyz[3 * self._order[mid] + axis],
+            self._build(start, mid),
+            self._build(mid, end),
+        )
+
+    @staticmethod
+    def _box_overlap(query: Tuple[float, float, float], lo: tuple, hi: tuple, limit_sq: float) -> int:
+        """
+        Classify a bounding box against a search ball
+
+        Compares squared distances only and stops as soon as the answer is
+        known, so most far-away boxes are rejected after one axis.
+
+        Returns:
+            -1 if the box is entirely outside the ball, 1 if entirely inside,
+            0 if it straddles the boundary
+        """
+        near = far = 0.0
+        contained = True
+        for d in range(3):
+            q = query[d]
+            below, above = lo[d] - q, q - hi[d]
+            if below > 0:
+                near += below * below
+            elif above > 0:
+                near += above * above
+            if near > limit_sq:
+                return -1
+            if contained:
+                edge = max(q - lo[d], hi[d] - q)
+                far += edge * edge
+                contained = far <= limit_sq
+        return 1 if contained else 0
+
+    def nearest(self, coordinates: Coordinates, k: int) -> List[Tuple[Location, float]]:
+        """
+        Find the k nearest locations
+
+        Args:
+            coordinates: Query coordinates
+            k: Number of neighbours
+
+        Returns:
+            List of (Location, distance_in_miles) tuples, nearest first
+        """
+        if self._root is None or k <= 0:
+            return []
+
+        query = _unit_vector(coordinates)
+        qx, qy, qz = query
+        xyz = self._xyz
+        order = self._order
+        heap: List[Tuple[float, int]] = []  # max-heap of (-dist_sq, index)
+
+        def search(node):
+            start, end, _, _, axis, split, left, right = node
+            if left is None:
+                for i in order[start:end]:
+                    j = 3 * i
+                    dx, dy, dz = xyz[j] - qx, xyz[j + 1] - qy, xyz[j + 2] - qz
+                    d2 = dx * dx + dy * dy + dz * dz
+                    if len(heap) < k:
+                        heapq.heappush(heap, (-d2, i))
+                    elif d2 < -heap[0][0]:
+                        heapq.heapreplace(heap, (-d2, i))
+                return
+
+            diff = query[axis] - split
+            near, far = (left, right) if diff < 0 else (right, left)
+            search(near)
+            if len(heap) < k or diff * diff < -heap[0][0]:
+                search(far)
+
+        search(self._root)
+
+        return [
+            (self._locations[i], _chord_to_miles(math.sqrt(-neg_d2)))
+            for neg_d2, i in sorted(heap, reverse=True)
+        ]
+
+    def within(self, coordinates: Coordinates, radius_miles: float) -> List[Tuple[Location, float]]:
+        """
+        Find all locations within a radius
+
+        Args:
+            coordinates: Query coordinates
+            radius_miles: Search radius
+
+        Returns:
+            List of (Location, distance_in_miles) tuples, unsorted
+        """
+        if self._root is None or radius_miles < 0:
+            return []
+
+        query = _unit_vector(coordinates)
+        chord = _miles_to_chord(radius_miles)
+        limit_sq = chord * chord
+        qx, qy, qz = query
+        xyz = self._xyz
+        order = self._order
+        box_overlap = self._box_overlap
+        hits: List[Tuple[int, float]] = []
+
+        def search(node):
+            start, end, lo, hi, _, _, left, right = node
+            overlap = box_overlap(query, lo, hi, limit_sq)
+            if overlap < 0:
+                return
+            contained = overlap > 0
+
+            if left is None or contained:
+                for i in order[start:end]:
+                    j = 3 * i
+                    dx, dy, dz = xyz[j] - qx, xyz[j + 1] - qy, xyz[j + 2] - qz
+                    d2 = dx * dx + dy * dy + dz * dz
+                    if contained or d2 <= limit_sq:
+                        hits.append((i, d2))
+                return
+
+            search(left)
+            search(right)
+
+        search(self._root)
+
+        return [
+            (self._locations[i], _chord_to_miles(math.sqrt(d2)))
+            for i, d2 in hits
+        ]
+
+
+# Default major cities (from scraper config):
+# (code, name, latitude, longitude, state, country, population, timezone)
+_DEFAULT_MAJOR_CITIES_DATA = (
+    # California
+    ('ca--los-angeles', 'Los Angeles, CA', 34.0522, -118.2437, 'CA', 'US', 3979576, 'America/Los_Angeles'),
+    ('ca--san-francisco', 'San Francisco, CA', 37.7749, -122.4194, 'CA', 'US', 873965, 'America/Los_Angeles'),
+    ('ca--san-diego', 'San Diego, CA', 32.7157, -117.1611, 'CA', 'US', 1423851, 'America/Los_Angeles'),
+
+    # Colorado
+    ('co--denver', 'Denver, CO', 39.7392, -104.9903, 'CO', 'US', 727211, 'America/Denver'),
+
+    # Washington, D.C.
+    ('dc--washington', 'Washington, DC', 38.9072, -77.0369, 'DC', 'US', 705749, 'America/New_York'),
+
+    # Florida
+    ('fl--miami', 'Miami, FL', 25.7617, -80.1918, 'FL', 'US', 442241, 'America/New_York'),
+
+    # Georgia
+    ('ga--atlanta', 'Atlanta, GA', 33.7490, -84.3880, 'GA', 'US', 498044, 'America/New_York'),
+
+    # Illinois
+    ('il--chicago', 'Chicago, IL', 41.8781, -87.6298, 'IL', 'US', 2693976, 'America/Chicago'),
+
+    # Massachusetts
+    ('ma--boston', 'Boston, MA', 42.3601, -71.0589, 'MA', 'US', 692600, 'America/New_York'),
+
+    # Nevada
+    ('nv--las-vegas', 'Las Vegas, NV', 36.1699, -115.1398, 'NV', 'US', 644018, 'America/Los_Angeles'),
+
+    # New York
+    ('ny--new-york', 'New York, NY', 40.7128, -74.0060, 'NY', 'US', 8398748, 'America/New_York'),
+
+    # Pennsylvania
+    ('pa--philadelphia', 'Philadelphia, PA', 39.9526, -75.1652, 'PA', 'US', 1602494, 'America/New_York'),
+
+    # Texas
+    ('tx--austin', 'Austin, TX', 30.2672, -97.7431, 'TX', 'US', 961855, 'America/Chicago'),
+    ('tx--dallas', 'Dallas, TX', 32.7767, -96.7970, 'TX', 'US', 1304379, 'America/Chicago'),
+    ('tx--houston', 'Houston, TX', 29.7604, -95.3698, 'TX', 'US', 2320268, 'America/Chicago'),
+
+    # Utah
+    ('ut--salt-lake-city', 'Salt Lake City, UT', 40.7608, -111.8910, 'UT', 'US', 199723, 'America/Denver'),
+
+    # Washington
+    ('wa--seattle', 'Seattle, WA', 47.6062, -122.3321, 'WA', 'US', 753675, 'America/Los_Angeles'),
+
+    # Canada
+    ('on--toronto', 'Toronto, ON', 43.6532, -79.3832, 'ON', 'CA', 2930000, 'America/Toronto'),
+)
+
+# Built once at import; each LocationDatabase loads its own copies, so these stay pristine
+DEFAULT_MAJOR_CITIES: Tuple[Location, ...] = tuple(
+    Location(
+        id=code,
+        code=code,
+        name=name,
+        tier=LocationTier.MAJOR_CITY,
+        coordinates=Coordinates(latitude, longitude),
+        state=state,
+        country=country,
+        population=population,
+        timezone=timezone
+    )
+    for code, name, latitude, longitude, state, country, population, timezone
+    in _DEFAULT_MAJOR_CITIES_DATA
+)
+
+
 class LocationDatabase:
     """
     In-memory location database with hierarchical structure
@@ -176,241 +513,47 @@ class LocationDatabase:
         self.locations: dict[str, Location] = {}
         self.major_cities: dict[str, Location] = {}
         self.secondary_cities: dict[str, Location] = {}
+        self._secondary_by_parent: dict[str, List[Location]] = defaultdict(list)
+        self._major_sorted: Optional[Tuple[Location, ...]] = None
+        self._major_index: Optional[SpatialIndex] = None
+        self._location_index: Optional[SpatialIndex] = None
         self._initialize_default_locations()
 
     def _initialize_default_locations(self):
-        """Load default major and secondary cities"""
-        
-        # MAJOR CITIES (from scraper config)
-        major_cities_data = [
-            # California
-            {
-                'code': 'ca--los-angeles',
-                'name': 'Los Angeles, CA',
-                'coords': Coordinates(34.0522, -118.2437),
-                'state': 'CA',
-                'country': 'US',
-                'population': 3979576,
-                'timezone': 'America/Los_Angeles'
-            },
-            {
-                'code': 'ca--san-francisco',
-                'name': 'San Francisco, CA',
-                'coords': Coordinates(37.7749, -122.4194),
-                'state': 'CA',
-                'country': 'US',
-                'population': 873965,
-                'timezone': 'America/Los_Angeles'
-            },
-            {
-                'code': 'ca--san-diego',
-                'name': 'San Diego, CA',
-                'coords': Coordinates(32.7157, -117.1611),
-                'state': 'CA',
-                'country': 'US',
-                'population': 1423851,
-                'timezone': 'America/Los_Angeles'
-            },
-            
-            # Colorado
-            {
-                'code': 'co--denver',
-                'name': 'Denver, CO',
-                'coords': Coordinates(39.7392, -104.9903),
-                'state': 'CO',
-                'country': 'US',
-                'population': 727211,
-                'timezone': 'America/Denver'
-            },
-            
-            # Washington, D.C.
-            {
-                'code': 'dc--washington',
-                'name': 'Washington, DC',
-                'coords': Coordinates(38.9072, -77.0369),
-                'state': 'DC',
-                'country': 'US',
-                'population': 705749,
-                'timezone': 'America/New_York'
-            },
-            
-            # Florida
-            {
-                'code': 'fl--miami',
-                'name': 'Miami, FL',
-                'coords': Coordinates(25.7617, -80.1918),
-                'state': 'FL',
-                'country': 'US',
-                'population': 442241,
-                'timezone': 'America/New_York'
-            },
-            
-            # Georgia
-            {
-                'code': 'ga--atlanta',
-                'name': 'Atlanta, GA',
-                'coords': Coordinates(33.7490, -84.3880),
-                'state': 'GA',
-                'country': 'US',
-                'population': 498044,
-                'timezone': 'America/New_York'
-            },
-            
-            # Illinois
-            {
-                'code': 'il--chicago',
-                'name': 'Chicago, IL',
-                'coords': Coordinates(41.8781, -87.6298),
-                'state': 'IL',
-                'country': 'US',
-                'population': 2693976,
-                'timezone': 'America/Chicago'
-            },
-            
-            # Massachusetts
-            {
-                'code': 'ma--boston',
-                'name': 'Boston, MA',
-                'coords': Coordinates(42.3601, -71.0589),
-                'state': 'MA',
-                'country': 'US',
-                'population': 692600,
-                'timezone': 'America/New_York'
-            },
-            
-            # Nevada
-            {
-                'code': 'nv--las-vegas',
-                'name': 'Las Vegas, NV',
-                'coords': Coordinates(36.1699, -115.1398),
-                'state': 'NV',
-                'country': 'US',
-                'population': 644018,
-                'timezone': 'America/Los_Angeles'
-            },
-            
-            # New York
-            {
-                'code': 'ny--new-york',
-                'name': 'New York, NY',
-                'coords': Coordinates(40.7128, -74.0060),
-                'state': 'NY',
-                'country': 'US',
-                'population': 8398748,
-                'timezone': 'America/New_York'
-            },
-            
-            # Pennsylvania
-            {
-                'code': 'pa--philadelphia',
-                'name': 'Philadelphia, PA',
-                'coords': Coordinates(39.9526, -75.1652),
-                'state': 'PA',
-                'country': 'US',
-                'population': 1602494,
-                'timezone': 'America/New_York'
-            },
-            
-            # Texas
-            {
-                'code': 'tx--austin',
-                'name': 'Austin, TX',
-                'coords': Coordinates(30.2672, -97.7431),
-                'state': 'TX',
-                'country': 'US',
-                'population': 961855,
-                'timezone': 'America/Chicago'
-            },
-            {
-                'code': 'tx--dallas',
-                'name': 'Dallas, TX',
-                'coords': Coordinates(32.7767, -96.7970),
-                'state': 'TX',
-                'country': 'US',
-                'population': 1304379,
-                'timezone': 'America/Chicago'
-            },
-            {
-                'code': 'tx--houston',
-                'name': 'Houston, TX',
-                'coords': Coordinates(29.7604, -95.3698),
-                'state': 'TX',
-                'country': 'US',
-                'population': 2320268,
-                'timezone': 'America/Chicago'
-            },
-            
-            # Utah
-            {
-                'code': 'ut--salt-lake-city',
-                'name': 'Salt Lake City, UT',
-                'coords': Coordinates(40.7608, -111.8910),
-                'state': 'UT',
-                'country': 'US',
-                'population': 199723,
-                'timezone': 'America/Denver'
-            },
-            
-            # Washington
-            {
-                'code': 'wa--seattle',
-                'name': 'Seattle, WA',
-                'coords': Coordinates(47.6062, -122.3321),
-                'state': 'WA',
-                'country': 'US',
-                'population': 753675,
-                'timezone': 'America/Los_Angeles'
-            },
-            
-            # Canada
-            {
-                'code': 'on--toronto',
-                'name': 'Toronto, ON',
-                'coords': Coordinates(43.6532, -79.3832),
-                'state': 'ON',
-                'country': 'CA',
-                'population': 2930000,
-                'timezone': 'America/Toronto'
-            },
-        ]
-
-        for data in major_cities_data:
-            location = Location(
-                id=data['code'],
-                code=data['code'],
-                name=data['name'],
-                tier=LocationTier.MAJOR_CITY,
-                coordinates=data['coords'],
-                state=data['state'],
-                country=data['country'],
-                population=data['population'],
-                timezone=data['timezone']
-            )
-            self.add_location(location)
+        """Load default major cities"""
+        # Locations are mutable, so every database gets its own copies
+        for location in DEFAULT_MAJOR_CITIES:
+            self.add_location(replace(location, metadata=dict(location.metadata)))
 
     def add_location(self, location: Location) -> None:
         """Add a location to the database"""
         self.locations[location.code] = location
+        self._location_index = None
         
         if location.tier == LocationTier.MAJOR_CITY:
             self.major_cities[location.code] = location
+            self._major_sorted = None
+            self._major_index = None
         elif location.tier == LocationTier.SECONDARY_CITY:
+            previous = self.secondary_cities.get(location.code)
+            if previous is not None:
+                self._secondary_by_parent[previous.parent_city].remove(previous)
             self.secondary_cities[location.code] = location
+            self._secondary_by_parent[location.parent_city].append(location)
 
     def get_location(self, code: str) -> Optional[Location]:
         """Get location by code"""
         return self.locations.get(code)
 
-    def get_major_cities(self) -> List[Location]:
-        """Get all major cities sorted by name"""
-        return sorted(self.major_cities.values(), key=lambda x: x.name)
+    def get_major_cities(self) -> Tuple[Location, ...]:
+        """Get all major cities sorted by name (cached until a major city is added)"""
+        if self._major_sorted is None:
+            self._major_sorted = tuple(sorted(self.major_cities.values(), key=lambda x: x.name))
+        return self._major_sorted
 
     def get_secondary_cities(self, parent_city_code: str) -> List[Location]:
         """Get secondary cities for a major city"""
-        return [
-            loc for loc in self.secondary_cities.values()
-            if loc.parent_city == parent_city_code
-        ]
+        return list(self._secondary_by_parent.get(parent_city_code, ()))
 
     def find_nearest_city(self, coordinates: Coordinates, limit: int = 5) -> List[Tuple[Location, float]]:
         """
@@ -423,12 +566,10 @@ class LocationDatabase:
         Returns:
             List of (Location, distance_in_miles) tuples
         """
-        distances = []
-        for city in self.major_cities.values():
-            dist = coordinates.distance_to(city.coordinates)
-            distances.append((city, dist))
+        if self._major_index is None:
+            self._major_index = SpatialIndex(list(self.major_cities.values()))
         
-        return sorted(distances, key=lambda x: x[1])[:limit]
+        return self._major_index.nearest(coordinates, limit)
 
     def get_nearby_locations(
         self,
@@ -445,10 +586,8 @@ class LocationDatabase:
         Returns:
             List of (Location, distance_in_miles) tuples
         """
-        nearby = []
-        for location in self.locations.values():
-            dist = center.distance_to(location.coordinates)
-            if dist <= radius_miles:
-                nearby.append((location, dist))
+        if self._location_index is None:
+            self._location_index = SpatialIndex(list(self.locations.values()))
         
+        nearby = self._location_index.within(center, radius_miles)
         return sorted(nearby, key=lambda x: x[1])
@@ -10,11 +10,51 @@ Supports:
 """
 
 from dataclasses import dataclass, field
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Set, Any
 from enum import Enum
-from datetime import datetime
-import hashlib
+import base64
+import hmac
 import secrets
+import time
+from hashlib import pbkdf2_hmac as _pbkdf2_hmac, scrypt as _scrypt
+
+
+# Password hashing parameters (scrypt, memory-hard)
+SCRYPT_N = 2 ** 15
+SCRYPT_R = 8
+SCRYPT_P = 1
+SCRYPT_DKLEN = 32
+# Stored scrypt hashes look like "scrypt$N$r$p$salt_b64$hash_b64"
+_SCRYPT_SCHEME = "scrypt$"
+_SCRYPT_PREFIX = f"{_SCRYPT_SCHEME}{SCRYPT_N}${SCRYPT_R}${SCRYPT_P}$"
+
+
+def _scrypt_maxmem(n: int, r: int) -> int:
+    """Memory limit for scrypt with the given cost parameters (twice the 128*n*r it needs)"""
+    return 128 * n * r * 2
+
+
+_SCRYPT_MAXMEM = _scrypt_maxmem(SCRYPT_N, SCRYPT_R)
+
+# Legacy PBKDF2 parameters, kept to verify hashes stored before the scrypt switch
+LEGACY_PBKDF2_ITERATIONS = 100000
+
+
+# Per-second cache for _utcnow_iso(); the date/time part only changes once a second.
+# (epoch_second, prefix) is kept as one tuple so threads read and replace it atomically
+_iso_cache = (-1, "")
+
+
+def _utcnow_iso() -> str:
+    """Current UTC time as an ISO 8601 string with microseconds"""
+    global _iso_cache
+    now_ns = time.time_ns()
+    second, remainder = divmod(now_ns, 1_000_000_000)
+    cached_second, prefix = _iso_cache
+    if second != cached_second:
+        prefix = time.strftime('%Y-%m-%dT%H:%M:%S', time.gmtime(second))
+        _iso_cache = (second, prefix)
+    return f"{prefix}.{remainder // 1000:06d}"
 
 
 class AuthProvider(Enum):
@@ -32,7 +72,7 @@ class UserRole(Enum):
     ADMIN = "admin"
 
 
-@dataclass
+@dataclass(slots=True)
 class UserEventRegistration:
     """
     User registration for an event (ticket tracking)
@@ -46,7 +86,7 @@ class UserEventRegistration:
     """
     id: str
     event_id: str
-    registered_at: str = field(default_factory=lambda: datetime.utcnow().isoformat())
+    registered_at: str = field(default_factory=_utcnow_iso)
     ticket_number: Optional[int] = None
     status: str = "registered"  # registered, cancelled, attended
 
@@ -60,7 +100,7 @@ class UserEventRegistration:
         }
 
 
-@dataclass
+@dataclass(slots=True)
 class UserProfile:
     """
     User profile information
@@ -85,7 +125,7 @@ class UserProfile:
     avatar_url: Optional[str] = None
     major_city: Optional[str] = None
     preferences: Dict[str, Any] = field(default_factory=dict)
-    created_at: str = field(default_factory=lambda: datetime.utcnow().isoformat())
+    created_at: str = field(default_factory=_utcnow_iso)
     last_login: Optional[str] = None
 
     def to_dict(self) -> dict:
@@ -113,12 +153,12 @@ class UserProfile:
             avatar_url=data.get('avatar_url'),
             major_city=data.get('major_city'),
             preferences=data.get('preferences', {}),
-            created_at=data.get('created_at', datetime.utcnow().isoformat()),
+            created_at=data['created_at'] if 'created_at' in data else _utcnow_iso(),
             last_login=data.get('last_login')
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class UserAccount:
     """
     User account with authentication and event management
@@ -128,7 +168,7 @@ class UserAccount:
         auth_provider: Authentication provider
         password_hash: Hashed password (if local auth)
         role: User role/permissions
-        event_registrations: Events user registered for
+        event_registrations: Events user registered for, keyed by event ID
         created_events: Events created by user
         metadata: Additional user data
         last_updated: Account last modification
@@ -139,42 +179,68 @@ class UserAccount:
     auth_provider: AuthProvider = AuthProvider.LOCAL
     password_hash: Optional[str] = None
     role: UserRole = UserRole.USER
-    event_registrations: List[UserEventRegistration] = field(default_factory=list)
-    created_events: List[str] = field(default_factory=list)  # Event IDs
+    event_registrations: Dict[str, UserEventRegistration] = field(default_factory=dict)
+    created_events: Set[str] = field(default_factory=set)  # Event IDs
     metadata: Dict[str, Any] = field(default_factory=dict)
-    last_updated: str = field(default_factory=lambda: datetime.utcnow().isoformat())
+    last_updated: str = field(default_factory=_utcnow_iso)
     verified: bool = False
     active: bool = True
     tokens: Dict[str, str] = field(default_factory=dict)  # OAuth tokens, refresh tokens, etc.
 
     def set_password(self, password: str) -> None:
-        """Hash and set password"""
-        salt = secrets.token_hex(16)
-        hash_obj = hashlib.pbkdf2_hmac(
-            'sha256',
+        """Hash and set password (scrypt)"""
+        salt = secrets.token_bytes(16)
+        hash_obj = _scrypt(
             password.encode('utf-8'),
-            salt.encode('utf-8'),
-            100000
+            salt=salt,
+            n=SCRYPT_N,
+            r=SCRYPT_R,
+            p=SCRYPT_P,
+            maxmem=_SCRYPT_MAXMEM,
+            dklen=SCRYPT_DKLEN
+        )
+        self.password_hash = (
+            f"{_SCRYPT_PREFIX}{base64.b64encode(salt).decode('ascii')}${base64.b64encode(hash_obj).decode('ascii')}"
         )
-        self.password_hash = f"{salt}${hash_obj.hex()}"
 
     def verify_password(self, password: str) -> bool:
-        """Verify password against hash"""
+        """Verify password against hash (scrypt, or legacy PBKDF2 'salt$hash')"""
         if not self.password_hash:
             return False
         
         try:
+            if self.password_hash.startswith(_SCRYPT_SCHEME):
+                _, n, r, p, salt_b64, hash_b64 = self.password_hash.split('$')
+                n, r, p = int(n), int(r), int(p)
+                expected = base64.b64decode(hash_b64)
+                hash_obj = _scrypt(
+                    password.encode('utf-8'),
+                    salt=base64.b64decode(salt_b64),
+                    n=n,
+                    r=r,
+                    p=p,
+                    maxmem=_scrypt_maxmem(n, r),
+                    dklen=len(expected)
+                )
+                return hmac.compare_digest(hash_obj, expected)
+
             salt, hash_hex = self.password_hash.split('$')
-            hash_obj = hashlib.pbkdf2_hmac(
+            hash_obj = _pbkdf2_hmac(
                 'sha256',
                 password.encode('utf-8'),
                 salt.encode('utf-8'),
-                100000
+                LEGACY_PBKDF2_ITERATIONS
             )
-            return hash_obj.hex() == hash_hex
+            return hmac.compare_digest(hash_obj, bytes.fromhex(hash_hex))
         except:
             return False
 
+    def needs_rehash(self) -> bool:
+        """Check if stored password hash uses outdated parameters"""
+        if not self.password_hash:
+            return False
+        return not self.password_hash.startswith(_SCRYPT_PREFIX)
+
     def register_for_event(self, event_id: str, ticket_number: Optional[int] = None) -> UserEventRegistration:
         """Register user for an event"""
         registration = UserEventRegistration(
@@ -182,22 +248,16 @@ class UserAccount:
             event_id=event_id,
             ticket_number=ticket_number
         )
-        self.event_registrations.append(registration)
+        self.event_registrations[event_id] = registration
         return registration
 
     def unregister_from_event(self, event_id: str) -> bool:
         """Unregister user from event"""
-        original_length = len(self.event_registrations)
-        self.event_registrations = [
-            r for r in self.event_registrations
-            if r.event_id != event_id
-        ]
-        return len(self.event_registrations) < original_length
+        return self.event_registrations.pop(event_id, None) is not None
 
     def create_event(self, event_id: str) -> None:
         """Add created event to user's list"""
-        if event_id not in self.created_events:
-            self.created_events.append(event_id)
+        self.created_events.add(event_id)
 
     def remove_created_event(self, event_id: str) -> bool:
         """Remove created event from user's list"""
@@ -208,11 +268,11 @@ class UserAccount:
 
     def get_registered_events(self) -> List[str]:
         """Get list of events user registered for"""
-        return [r.event_id for r in self.event_registrations]
+        return list(self.event_registrations)
 
     def is_registered_for(self, event_id: str) -> bool:
         """Check if user registered for event"""
-        return any(r.event_id == event_id for r in self.event_registrations)
+        return event_id in self.event_registrations
 
     def to_dict(self, include_sensitive: bool = False) -> dict:
         """Serialize user account to dictionary"""
@@ -220,8 +280,8 @@ class UserAccount:
             'profile': self.profile.to_dict(),
             'auth_provider': self.auth_provider.value,
             'role': self.role.value,
-            'event_registrations': [r.to_dict() for r in self.event_registrations],
-            'created_events': self.created_events,
+            'event_registrations': [r.to_dict() for r in self.event_registrations.values()],
+            'created_events': sorted(self.created_events),
             'metadata': self.metadata,
             'last_updated': self.last_updated,
             'verified': self.verified,
@@ -243,9 +303,10 @@ class UserAccount:
         auth_provider = AuthProvider(data.get('auth_provider', 'local'))
         role = UserRole(data.get('role', 'user'))
         
-        registrations = [
-            UserEventRegistration(**r) for r in data.get('event_registrations', [])
-        ]
+        registrations = {
+            r['event_id']: UserEventRegistration(**r)
+            for r in data.get('event_registrations', [])
+        }
         
         return UserAccount(
             profile=profile,
@@ -253,9 +314,9 @@ class UserAccount:
             password_hash=data.get('password_hash'),
             role=role,
             event_registrations=registrations,
-            created_events=data.get('created_events', []),
+            created_events=set(data.get('created_events', [])),
             metadata=data.get('metadata', {}),
-            last_updated=data.get('last_updated', datetime.utcnow().isoformat()),
+            last_updated=data['last_updated'] if 'last_updated' in data else _utcnow_iso(),
             verified=data.get('verified', False),
             active=data.get('active', True),
             tokens=data.get('tokens', {})
@@ -272,8 +333,8 @@ class UserStore:
     def __init__(self):
         """Initialize user store"""
         self.users: Dict[str, UserAccount] = {}
-        self.username_index: Dict[str, str] = {}  # username -> user_id
-        self.email_index: Dict[str, str] = {}      # email -> user_id
+        self.username_index: Dict[str, UserAccount] = {}  # username -> user
+        self.email_index: Dict[str, UserAccount] = {}     # email -> user
 
     def create_user(
         self,
@@ -298,8 +359,8 @@ class UserStore:
         
         # Add to store and indexes
         self.users[user_id] = user
-        self.username_index[username] = user_id
-        self.email_index[email] = user_id
+        self.username_index[username] = user
+        self.email_index[email] = user
         
         return user
 
@@ -309,19 +370,20 @@ class UserStore:
 
     def get_user_by_username(self, username: str) -> Optional[UserAccount]:
         """Get user by username"""
-        user_id = self.username_index.get(username)
-        return self.users.get(user_id) if user_id else None
+        return self.username_index.get(username)
 
     def get_user_by_email(self, email: str) -> Optional[UserAccount]:
         """Get user by email"""
-        user_id = self.email_index.get(email)
-        return self.users.get(user_id) if user_id else None
+        return self.email_index.get(email)
 
     def authenticate(self, username: str, password: str) -> Optional[UserAccount]:
         """Authenticate user with username and password"""
-        user = self.get_user_by_username(username)
+        user = self.username_index.get(username)
         if user and user.verify_password(password):
-            user.profile.last_login = datetime.utcnow().isoformat()
+            # Transparently upgrade legacy hashes while the plaintext is at hand
+            if user.needs_rehash():
+                user.set_password(password)
+            user.profile.last_login = _utcnow_iso()
             return user
         return None
 
@@ -343,17 +405,23 @@ class UserStore:
         if 'preferences' in updates:
             user.profile.preferences.update(updates['preferences'])
         
-        user.last_updated = datetime.utcnow().isoformat()
+        user.last_updated = _utcnow_iso()
         return user
 
     def get_stats(self) -> dict:
         """Get user store statistics"""
+        verified_users = 0
+        active_users = 0
+        by_role = {role.value: 0 for role in UserRole}
+        
+        for user in self.users.values():
+            verified_users += user.verified
+            active_users += user.active
+            by_role[user.role.value] += 1
+        
         return {
             'total_users': len(self.users),
-            'verified_users': sum(1 for u in self.users.values() if u.verified),
-            'active_users': sum(1 for u in self.users.values() if u.active),
-            'by_role': {
-                role.value: sum(1 for u in self.users.values() if u.role == role)
-                for role in UserRole
-            }
+            'verified_users': verified_users,
+            'active_users': active_users,
+            'by_role': by_role
         }
@@ -5,10 +5,16 @@ Integration module connecting scraper functionality to the database
 
 import sys
 import os
-import json
+import re
+import time
+import queue
+import atexit
 import asyncio
-from datetime import datetime
-from typing import Dict, List
+import logging
+from contextlib import aclosing
+from logging.handlers import QueueHandler, QueueListener
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
 
 # Add scraper to path - handle different directory structures
 backend_dir = os.path.dirname(os.path.abspath(__file__))
@@ -20,11 +26,22 @@ if scraper_dir not in sys.path:
 
 # Try to import, with better error handling
 try:
-    from database import save_events, get_active_subscribers
+    from database import (
+        save_events, iter_active_subscribers_by_city, get_upcoming_events_by_city, log_email_sent_bulk
+    )
+    from email_service import send_prepared_email, PreparedEmail, SMTPConnectionPool, SendRateLimiter
 except ImportError:
     # If running directly from backend directory
     sys.path.insert(0, backend_dir)
-    from database import save_events, get_active_subscribers
+    from database import (
+        save_events, iter_active_subscribers_by_city, get_upcoming_events_by_city, log_email_sent_bulk
+    )
+    from email_service import send_prepared_email, PreparedEmail, SMTPConnectionPool, SendRateLimiter
+
+try:
+    from supabase_integration import sync_events_to_supabase
+except ImportError:
+    sync_events_to_supabase = None
 
 try:
     from config import CONFIG, load_config
@@ -306,117 +323,168 @@ CITY_MAPPING = {
     }
 }
 
+# Display name per city id, for lookups that only need the name
+CITY_NAMES = {city_id: city['name'] for city_id, city in CITY_MAPPING.items()}
 
-import logging
-import os
-import asyncio
-from pathlib import Path
+# Event source inferred from the link's domain when a scraper didn't set one
+EVENT_SOURCE_DOMAINS = {
+    'eventbrite.com': 'eventbrite',
+    'meetup.com': 'meetup',
+    'lu.ma': 'luma',
+}
+EVENT_SOURCE_PATTERN = re.compile('|'.join(re.escape(domain) for domain in EVENT_SOURCE_DOMAINS))
 
-# Ensure logs directory exists
-log_dir = Path("logs")
-log_dir.mkdir(parents=True, exist_ok=True)
 
-# Lock to prevent concurrent scraper runs that could interfere with each other
-scraper_lock = asyncio.Lock()
+# Maximum number of cities refreshed at the same time; one by default, raise it
+# to overlap city scrapes
+CITY_REFRESH_CONCURRENCY = int(os.getenv('CITY_REFRESH_CONCURRENCY', '1'))
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler('logs/app.log'),
-        logging.StreamHandler()
-    ]
-)
+# Scrape results younger than this are reused instead of re-running the scrapers (0 disables)
+SCRAPE_CACHE_TTL_SECONDS = float(os.getenv('SCRAPE_CACHE_TTL_SECONDS', '900'))
+
+# Stop a city's digest once at least this many sends were attempted and more
+# than this share of them failed (SMTP down, auth revoked, provider lockout)
+DIGEST_ABORT_MIN_SENDS = 30
+DIGEST_ABORT_FAILURE_RATE = 1 / 3
+
+# Last scrape per city: {city_id: (monotonic time scraped, events)}
+_recent_scrapes: Dict[str, Tuple[float, List[Dict]]] = {}
 
 logger = logging.getLogger(__name__)
 
 
-async def scrape_city_events(city_id: str) -> Dict:
+def configure_logging(log_file: str = 'logs/app.log') -> None:
     """
-    Scrape events for a specific city and save to database.
-    Returns statistics about the scraping operation.
+    Send INFO logs to log_file and the console.
+    
+    Called by entry points (the API app, cron.py and this module's __main__)
+    rather than at import, so importing this module has no logging or
+    filesystem side effects. Records are queued by a QueueHandler and written
+    by a QueueListener thread, so logging from the event loop never blocks on
+    file or console I/O. Does nothing if logging is already configured.
     """
-    from scraper.run import run_all_scrapers
-    import shutil
+    if logging.getLogger().handlers:
+        return
 
-    logger.info(f"Starting scrape for city: {city_id}")
+    log_dir = os.path.dirname(log_file)
+    if log_dir:
+        os.makedirs(log_dir, exist_ok=True)
+
+    formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    handlers = [logging.FileHandler(log_file), logging.StreamHandler()]
+    for handler in handlers:
+        handler.setFormatter(formatter)
+
+    log_queue = queue.Queue(-1)
+    listener = QueueListener(log_queue, *handlers)
+    listener.start()
+    # Flush queued records before the interpreter exits
+    atexit.register(listener.stop)
+
+    queue_handler = QueueHandler(log_queue)
+    # Only merge the message args here; the listener's handlers add the full format
+    queue_handler.setFormatter(logging.Formatter('%(message)s'))
+    logging.basicConfig(level=logging.INFO, handlers=[queue_handler])
 
-    # Load current config
-    config = load_config()
 
-    # Update config for this city
-    config['LOCATION'] = city_id
+def _tag_event_sources(events: List[Dict]) -> None:
+    """Add source to events if missing, inferred from the link"""
+    for event in events:
+        if 'source' not in event:
+            match = EVENT_SOURCE_PATTERN.search(event.get('link', ''))
+            event['source'] = EVENT_SOURCE_DOMAINS[match.group()] if match else 'unknown'
 
-    # Run the scrapers - use lock to prevent concurrent access to shared resources
-    logger.info(f"Running scrapers for {city_id}...")
 
-    # Change to scraper directory and run - protected by lock to prevent race conditions
-    scraper_dir = os.path.join(os.path.dirname(__file__), '../scraper')
-    original_dir = os.getcwd()
+async def _scrape_and_save_city(city_id: str) -> Tuple[List[Dict], Dict]:
+    """
+    Run the scrapers for a city, saving each source's events to the database
+    while the next source is still being scraped.
+    Returns the merged, deduplicated events and the combined save counts.
+    """
+    # Imported lazily: it pulls in Playwright and every scraper module
+    from scraper.run import run_all_scrapers
 
-    async with scraper_lock:
-        # Save temporary config (inside the lock to prevent race conditions)
-        config_path = os.path.join(os.path.dirname(__file__), '../scraper/config.json')
-        with open(config_path, 'w') as f:
-            json.dump(config, f, indent=2)
+    event_batches: asyncio.Queue = asyncio.Queue()
 
+    async def produce() -> List[Dict]:
         try:
-            os.chdir(scraper_dir)
-            await run_all_scrapers()
+            return await run_all_scrapers(location_override=city_id, event_queue=event_batches)
         finally:
-            os.chdir(original_dir)
+            event_batches.put_nowait(None)  # Tell the consumer the scrape is over
 
-        # Read the results while holding the lock
-        all_events_file = os.path.join(scraper_dir, 'all_events.json')
+    producer = asyncio.create_task(produce())
+    totals = {"saved": 0, "updated": 0}
+    try:
+        while (batch := await event_batches.get()) is not None:
+            if not batch:
+                continue
+            _tag_event_sources(batch)
+            result = await save_events(batch, city_id)
+            totals["saved"] += result['saved']
+            totals["updated"] += result['updated']
+    except BaseException:
+        producer.cancel()
+        raise
+
+    return await producer, totals
 
-        if not os.path.exists(all_events_file):
-            logger.warning(f"No events found for {city_id}")
-            return {
+
+async def scrape_city_events(city_id: str) -> Dict:
+    """
+    Scrape events for a specific city and save to database.
+    Returns statistics about the scraping operation.
+    """
+    logger.info(f"Starting scrape for city: {city_id}")
+
+    # Scraping takes minutes; reuse a recent result for this city instead
+    cached = _recent_scrapes.get(city_id)
+    from_cache = cached is not None and time.monotonic() - cached[0] < SCRAPE_CACHE_TTL_SECONDS
+
+    if from_cache:
+        logger.info(f"Using events scraped {time.monotonic() - cached[0]:.0f}s ago for {city_id}")
+        events_data = cached[1]
+        result = None
+    else:
+        # Run the scrapers for this city; the location is passed directly and the
+        # scrapers resolve their files against the scraper directory, so no shared
+        # config write, chdir or lock is needed and cities can run concurrently
+        logger.info(f"Running scrapers for {city_id}...")
+        events_data, result = await _scrape_and_save_city(city_id)
+        if events_data:
+            _recent_scrapes[city_id] = (time.monotonic(), events_data)
+
+    if not events_data:
+        logger.warning(f"No events found for {city_id}")
+        return {
             "city_id": city_id,
             "status": "error",
             "message": "No events found",
             "events_count": 0
         }
 
-    with open(all_events_file, 'r') as f:
-        data = json.load(f)
-        events_data = data.get('events', [])
-
-    # Add source to events if missing
-    for event in events_data:
-        if 'source' not in event:
-            # Try to infer source from link
-            link = event.get('link', '')
-            if 'eventbrite.com' in link:
-                event['source'] = 'eventbrite'
-            elif 'meetup.com' in link:
-                event['source'] = 'meetup'
-            elif 'lu.ma' in link:
-                event['source'] = 'luma'
-            else:
-                event['source'] = 'unknown'
-
-    # Save to database
-    logger.info(f"Saving {len(events_data)} events to database...")
-    result = await save_events(events_data, city_id)
+    if result is None:
+        # Save to database
+        _tag_event_sources(events_data)
+        logger.info(f"Saving {len(events_data)} events to database...")
+        result = await save_events(events_data, city_id)
 
     logger.info(f"Saved {result['saved']} new events, updated {result['updated']} existing events")
 
     # Sync to Supabase if configured
-    try:
-        from supabase_integration import sync_events_to_supabase
-        supabase_result = await sync_events_to_supabase(events_data, city_id)
-        logger.info(f"Supabase sync result: {supabase_result}")
-    except Exception as e:
-        logger.warning(f"Supabase sync failed (non-critical): {e}")
+    if sync_events_to_supabase is not None:
+        try:
+            supabase_result = await sync_events_to_supabase(events_data, city_id)
+            logger.info(f"Supabase sync result: {supabase_result}")
+        except Exception as e:
+            logger.warning(f"Supabase sync failed (non-critical): {e}")
 
     return {
         "city_id": city_id,
         "status": "success",
         "events_scraped": len(events_data),
         "events_saved": result['saved'],
-        "events_updated": result['updated']
+        "events_updated": result['updated'],
+        "cached": from_cache
     }
 
 
@@ -425,8 +493,6 @@ async def refresh_all_cities() -> Dict:
     Scrape events for all supported cities.
     Returns aggregated statistics.
     """
-    from scraper.run import run_all_scrapers
-
     supported_cities = CONFIG.get('SUPPORTED_LOCATIONS', [])
 
     results = {
@@ -439,147 +505,177 @@ async def refresh_all_cities() -> Dict:
 
     logger.info(f"Starting refresh of {len(supported_cities)} cities...")
 
-    for city_id in supported_cities:
-        try:
-            result = await scrape_city_events(city_id)
-
-            if result['status'] == 'success':
-                results['successful'] += 1
-                results['total_events'] += result.get('events_scraped', 0)
-            else:
-                results['failed'] += 1
+    # Cities are I/O bound and scrape independently, so overlap them; the
+    # semaphore caps how many run at once
+    semaphore = asyncio.Semaphore(CITY_REFRESH_CONCURRENCY)
 
-            results['city_results'].append(result)
+    async def refresh_city(city_id: str) -> Dict:
+        async with semaphore:
+            return await scrape_city_events(city_id)
 
-            # Add a small delay between cities to avoid rate limiting
-            await asyncio.sleep(2)
+    city_results = await asyncio.gather(
+        *(refresh_city(city_id) for city_id in supported_cities),
+        return_exceptions=True
+    )
 
-        except Exception as e:
-            logger.error(f"Error scraping {city_id}: {e}")
+    for city_id, result in zip(supported_cities, city_results):
+        # CancelledError and friends come back as BaseException, not Exception
+        if isinstance(result, BaseException):
+            logger.error(f"Error scraping {city_id}: {result!r}")
             results['failed'] += 1
             results['city_results'].append({
                 "city_id": city_id,
                 "status": "error",
-                "error": str(e)
+                "error": str(result) or type(result).__name__
             })
+            continue
+
+        if result['status'] == 'success':
+            results['successful'] += 1
+            results['total_events'] += result.get('events_scraped', 0)
+        else:
+            results['failed'] += 1
+
+        results['city_results'].append(result)
 
     logger.info(f"Refresh complete. Success: {results['successful']}, Failed: {results['failed']}, Total events: {results['total_events']}")
 
     return results
 
 
-async def send_weekly_digest(batch_size: int = 10, delay_between_batches: float = 1.0):
+async def send_weekly_digest(batch_size: int = 10):
     """
     Send weekly email digest to all active subscribers.
     This function should be called by a scheduled job (cron).
-    """
-    from email_service import send_email
 
-    print(f"[{datetime.now()}] Starting weekly digest...")
+    Cities are processed concurrently and, within a city, subscribers are
+    mailed concurrently; batch_size caps the number of sends in flight
+    across the whole run and sizes the pool of persistent SMTP connections
+    those sends share. Each send also takes a token from a shared rate
+    limiter so the run stays within the email provider's rate limits.
+    """
+    logger.info("Starting weekly digest...")
 
     supported_cities = CONFIG.get('SUPPORTED_LOCATIONS', [])
+    send_semaphore = asyncio.Semaphore(batch_size)
+    rate_limiter = SendRateLimiter()
+
+    async def send_to_subscriber(subscriber, city_id: str, email: PreparedEmail, events_count: int, smtp: SMTPConnectionPool, send_stats: Dict, sent_log: List[Dict]) -> None:
+        """Send one digest and add its email log entry to sent_log, unless the city was aborted"""
+        log_entry = {
+            "subscription_id": subscriber.id,
+            "email": subscriber.email,
+            "city_id": city_id,
+            "events_count": events_count,
+        }
+        async with send_semaphore, rate_limiter:
+            if send_stats["aborted"]:
+                return
 
-    for city_id in supported_cities:
-        # Get active subscribers for this city
-        subscribers = await get_active_subscribers(city_id)
-
-        if not subscribers:
-            print(f"[{datetime.now()}] No active subscribers for {city_id}")
-            continue
+            try:
+                log_entry["success"] = await send_prepared_email(subscriber.email, email, smtp)
+                logger.info(f"Sent digest to {subscriber.email}")
 
-        print(f"[{datetime.now()}] Sending digest to {len(subscribers)} subscribers for {city_id}")
+            except Exception as e:
+                logger.error(f"Error sending to {subscriber.email}: {e}")
+                log_entry["success"] = False
+                log_entry["error_message"] = str(e)
 
-        # Get events from database for the next 7 days
-        from database import AsyncSessionLocal, Event
-        from sqlalchemy import select
-        from datetime import timedelta
+        send_stats["attempted"] += 1
+        if not log_entry["success"]:
+            send_stats["failed"] += 1
+            if (send_stats["attempted"] >= DIGEST_ABORT_MIN_SENDS and not send_stats["aborted"]
+                    and send_stats["failed"] / send_stats["attempted"] > DIGEST_ABORT_FAILURE_RATE):
+                send_stats["aborted"] = True
+                logger.error(f"[ABORT] {send_stats['failed']}/{send_stats['attempted']} digest sends failed for {city_id}, skipping the rest")
 
-        end_date = datetime.utcnow().date() + timedelta(days=7)
+        log_entry["sent_at"] = datetime.utcnow()
+        sent_log.append(log_entry)
 
-        async with AsyncSessionLocal() as session:
-            result = await session.execute(
-                select(Event).where(
-                    Event.city_id == city_id,
-                    Event.date >= datetime.utcnow().date(),
-                    Event.date <= end_date
-                ).order_by(Event.date)
-            )
-            events = result.scalars().all()
+    async def send_city_digest(city_id: str, subscribers: list, events: list, smtp: SMTPConnectionPool):
+        logger.info(f"Sending digest to {len(subscribers)} subscribers for {city_id}")
 
         if not events:
-            print(f"[{datetime.now()}] No events found for {city_id} in next 7 days")
-            continue
+            logger.info(f"No events found for {city_id} in next 7 days")
+            return
 
         # Prepare email content
-        city_name = CITY_MAPPING.get(city_id, {}).get('name', city_id)
+        city_name = CITY_NAMES.get(city_id, city_id)
 
-        email_content = f"""
+        # Built and encoded once per city and shared by every subscriber's send
+        subject = f"Weekly Events in {city_name}"
+        email_parts = [f"""
         <h2>Weekly Events in {city_name}</h2>
         <p>Here are the upcoming events for the next 7 days:</p>
         <ul>
-        """
-
-        for event in events[:20]:  # Limit to 20 events
-            email_content += f"""
+        """]
+        email_parts.extend(
+            f"""
             <li>
                 <strong>{event.title}</strong><br/>
                 {event.date} @ {event.time}<br/>
                 {event.location}
             </li>
             """
+            for event in events
+        )
+        email_parts.append("</ul>")
+        email = PreparedEmail(subject, "".join(email_parts))
 
-        email_content += "</ul>"
-
-        # Process subscribers in batches to avoid overwhelming email service
-        for i in range(0, len(subscribers), batch_size):
-            batch = subscribers[i:i + batch_size]
-
-            # Send emails in batch
-            for subscriber in batch:
-                try:
-                    success = await send_email(
-                        subscriber.email,
-                        f"Weekly Events in {city_name}",
-                        email_content
-                    )
-
-                    # Log the email send
-                    from database import log_email_sent
-                    await log_email_sent(
-                        subscription_id=subscriber.id,
-                        email=subscriber.email,
-                        city_id=city_id,
-                        events_count=len(events),
-                        success=success
-                    )
-
-                    print(f"[{datetime.now()}] Sent digest to {subscriber.email}")
-
-                except Exception as e:
-                    print(f"[{datetime.now()}] Error sending to {subscriber.email}: {e}")
-                    # Log the failure
-                    from database import log_email_sent
-                    await log_email_sent(
-                        subscription_id=subscriber.id,
-                        email=subscriber.email,
-                        city_id=city_id,
-                        events_count=len(events),
-                        success=False,
-                        error_message=str(e)
-                    )
-
-            # Delay between batches to avoid rate limiting
-            if i + batch_size < len(subscribers):
-                await asyncio.sleep(delay_between_batches)
-
-        # Add delay between cities
-        await asyncio.sleep(1)
-
-    print(f"[{datetime.now()}] Weekly digest complete")
+        send_stats = {"attempted": 0, "failed": 0, "aborted": False}
+        sent_log = []
+        try:
+            async with asyncio.TaskGroup() as tg:
+                for subscriber in subscribers:
+                    tg.create_task(send_to_subscriber(subscriber, city_id, email, len(events), smtp, send_stats, sent_log))
+        finally:
+            # Record every finished send for this city in a single transaction,
+            # even when the sends were cut short by an error or cancellation,
+            # so a re-run never mails them again unlogged
+            if sent_log:
+                await asyncio.shield(log_email_sent_bulk(sent_log))
+
+    async def run_city_digest(city_id: str, subscribers: list, events: list, smtp: SMTPConnectionPool) -> None:
+        # Log a city's failure instead of letting it cancel the other cities' sends
+        try:
+            await send_city_digest(city_id, subscribers, events, smtp)
+        except Exception as e:
+            logger.error(f"Error sending digest for {city_id}: {e}")
+
+    # The next 7 days of events (up to 20 per city) for every city in one
+    # query, loaded before any send starts so a failure here mails nobody
+    today = datetime.utcnow().date()
+    events_by_city = await get_upcoming_events_by_city(
+        supported_cities, today, today + timedelta(days=7), per_city_limit=20
+    )
+    subscribed_cities = set()
+    subscribers_complete = False
+
+    # One pool of SMTP logins shared by every city instead of a connection per email
+    async with SMTPConnectionPool(size=batch_size) as smtp:
+        async with asyncio.TaskGroup() as tg:
+            # Subscribers arrive a city at a time in one query; each city's
+            # sends start while the following cities are still being fetched
+            try:
+                async with aclosing(iter_active_subscribers_by_city(supported_cities)) as subscriber_batches:
+                    async for city_id, subscribers in subscriber_batches:
+                        subscribed_cities.add(city_id)
+                        tg.create_task(run_city_digest(city_id, subscribers, events_by_city.get(city_id, []), smtp))
+                subscribers_complete = True
+            except Exception as e:
+                # Cities already sending finish normally; no further cities start
+                logger.error(f"Error loading digest subscribers, skipping the remaining cities: {e}")
+
+    if subscribers_complete:
+        for city_id in supported_cities:
+            if city_id not in subscribed_cities:
+                logger.info(f"No active subscribers for {city_id}")
+
+    logger.info("Weekly digest complete")
 
 
 if __name__ == "__main__":
     # Test scraping for a single city
-    import sys
+    configure_logging()
     city = sys.argv[1] if len(sys.argv) > 1 else 'ca--los-angeles'
     asyncio.run(scrape_city_events(city))
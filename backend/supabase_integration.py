@@ -19,8 +19,16 @@ except ImportError:
 
 logger = logging.getLogger(__name__)
 
+# Rows per upsert request, kept well under Supabase's request payload limit
+UPSERT_BATCH_SIZE = 500
+
 class SupabaseManager:
-    """Manages Supabase connection and operations"""
+    """
+    Manages Supabase connection and operations
+    
+    The supabase client is synchronous, so request execution is pushed to a
+    worker thread with asyncio.to_thread to keep the event loop responsive.
+    """
     
     def __init__(self):
         self.url = os.environ.get('SUPABASE_URL')
@@ -53,49 +61,49 @@ class SupabaseManager:
         
         try:
             synced_count = 0
-            updated_count = 0
+            now = datetime.utcnow().isoformat()
             
+            # Prepare event data for Supabase, keyed by link so duplicates within
+            # one batch collapse (an upsert can't touch the same row twice)
+            rows_by_link = {}
             for event in events_data:
-                # Prepare event data for Supabase, ensuring city_id is properly set
-                supabase_event = {
+                link = event.get('link')
+                if not link:
+                    continue
+                rows_by_link[link] = {
                     "title": event.get('title'),
-                    "link": event.get('link'),
+                    "link": link,
                     "date": event.get('date'),
                     "time": event.get('time'),
                     "location": event.get('location'),
                     "description": event.get('description'),
                     "source": event.get('source', 'unknown'),
                     "city_id": event.get('city_id', city_id),  # Use event's city_id if available, otherwise use passed city_id
-                    "synced_at": datetime.utcnow().isoformat(),
-                    "last_scraped": datetime.utcnow().isoformat()
+                    "synced_at": now,
+                    "last_scraped": now
                 }
-                
+            rows = list(rows_by_link.values())
+            
+            # Insert or update by the unique link in bulk instead of a
+            # select + insert/update round trip per event
+            for start in range(0, len(rows), UPSERT_BATCH_SIZE):
+                batch = rows[start:start + UPSERT_BATCH_SIZE]
                 try:
-                    # Try to find existing event by link
-                    existing = self.client.table('events').select('id').eq(
-                        'link', event.get('link')
-                    ).execute()
-                    
-                    if existing.data and len(existing.data) > 0:
-                        # Update existing event
-                        self.client.table('events').update(
-                            supabase_event
-                        ).eq('link', event.get('link')).execute()
-                        updated_count += 1
-                    else:
-                        # Insert new event
-                        self.client.table('events').insert(supabase_event).execute()
-                        synced_count += 1
+                    await asyncio.to_thread(
+                        self.client.table('events').upsert(
+                            batch, on_conflict='link'
+                        ).execute
+                    )
+                    synced_count += len(batch)
                 
                 except Exception as e:
-                    logger.error(f"Failed to sync event {event.get('title')}: {e}")
+                    logger.error(f"Failed to sync batch of {len(batch)} events: {e}")
                     continue
             
-            logger.info(f"Supabase sync complete: {synced_count} new, {updated_count} updated")
+            logger.info(f"Supabase sync complete: {synced_count} upserted")
             return {
                 "status": "success",
-                "synced": synced_count,
-                "updated": updated_count
+                "synced": synced_count
             }
         
         except Exception as e:
@@ -112,11 +120,13 @@ class SupabaseManager:
             return []
         
         try:
-            response = self.client.table('events').select('*').eq(
-                'city_id', city_id
-            ).gte('last_scraped', since).order(
-                'synced_at', desc=True
-            ).execute()
+            response = await asyncio.to_thread(
+                self.client.table('events').select('*').eq(
+                    'city_id', city_id
+                ).gte('last_scraped', since).order(
+                    'synced_at', desc=True
+                ).execute
+            )
             
             return response.data if response.data else []
         
@@ -133,9 +143,11 @@ class SupabaseManager:
             return []
         
         try:
-            response = self.client.table('events').select('*').eq(
-                'city_id', city_id
-            ).order('date').limit(limit).execute()
+            response = await asyncio.to_thread(
+                self.client.table('events').select('*').eq(
+                    'city_id', city_id
+                ).order('date').limit(limit).execute
+            )
             
             return response.data if response.data else []
         
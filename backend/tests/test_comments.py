@@ -0,0 +1,120 @@
+"""
+Tests for the comment RateLimiter in backend.models.comments
+"""
+
+import threading
+import types
+
+import pytest
+
+from backend.models import comments
+from backend.models.comments import RateLimiter
+
+
+class FakeClock:
+    """Stands in for time.monotonic so windows can be stepped through"""
+
+    def __init__(self, start: float = 1_000_000.0):
+        self.now = start
+
+    def monotonic(self) -> float:
+        return self.now
+
+    def advance(self, seconds: float) -> None:
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(comments, "time", types.SimpleNamespace(monotonic=fake.monotonic))
+    return fake
+
+
+def test_try_acquire_enforces_minute_limit(clock):
+    limiter = RateLimiter(max_per_minute=3, max_per_hour=20, max_per_day=100)
+
+    for _ in range(3):
+        assert limiter.try_acquire("ip") == (True, None)
+
+    allowed, reason = limiter.try_acquire("ip")
+    assert not allowed
+    assert "wait" in reason
+    # A rejected attempt is not recorded
+    assert limiter.get_stats("ip")["comments_this_minute"] == 3
+
+    clock.advance(61)
+    assert limiter.try_acquire("ip") == (True, None)
+
+
+def test_try_acquire_enforces_hour_and_day_limits(clock):
+    limiter = RateLimiter(max_per_minute=100, max_per_hour=5, max_per_day=8)
+
+    for _ in range(5):
+        assert limiter.try_acquire("user")[0]
+    allowed, reason = limiter.try_acquire("user")
+    assert not allowed
+    assert "Hourly" in reason
+
+    clock.advance(3601)
+    for _ in range(3):
+        assert limiter.try_acquire("user")[0]
+    allowed, reason = limiter.try_acquire("user")
+    assert not allowed
+    assert "Daily" in reason
+
+    clock.advance(86401)
+    assert limiter.try_acquire("user") == (True, None)
+
+
+def test_identifiers_are_limited_independently(clock):
+    limiter = RateLimiter(max_per_minute=1)
+
+    assert limiter.try_acquire("a")[0]
+    assert not limiter.try_acquire("a")[0]
+    assert limiter.try_acquire("b")[0]
+
+
+def test_try_acquire_is_atomic_across_threads(clock):
+    limiter = RateLimiter(max_per_minute=5, max_per_hour=5, max_per_day=5)
+    results = []
+    barrier = threading.Barrier(20)
+
+    def worker():
+        barrier.wait()
+        results.append(limiter.try_acquire("shared")[0])
+
+    threads = [threading.Thread(target=worker) for _ in range(20)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert results.count(True) == 5
+
+
+def test_prune_drops_expired_identifiers_first(clock):
+    limiter = RateLimiter(max_identifiers=3)
+
+    limiter.try_acquire("old")
+    clock.advance(86401)
+    limiter.try_acquire("recent-1")
+    limiter.try_acquire("recent-2")
+
+    limiter.try_acquire("new")
+
+    assert set(limiter.comment_history) == {"recent-1", "recent-2", "new"}
+
+
+def test_prune_evicts_least_recently_seen_when_full(clock):
+    limiter = RateLimiter(max_identifiers=10)
+
+    for i in range(10):
+        limiter.try_acquire(f"id-{i}")
+        clock.advance(1)
+
+    limiter.try_acquire("new")
+
+    assert len(limiter.comment_history) == 10
+    assert "id-0" not in limiter.comment_history
+    assert "new" in limiter.comment_history
@@ -0,0 +1,88 @@
+"""
+Tests for the SendRateLimiter token bucket in backend.email_service
+"""
+
+import asyncio
+import types
+
+import pytest
+
+from backend import email_service
+from backend.email_service import SendRateLimiter
+
+
+class FakeClock:
+    """Virtual time: sleeping advances the clock instead of waiting"""
+
+    def __init__(self, start: float = 1000.0):
+        self.now = start
+        self.sleeps = []
+
+    def monotonic(self) -> float:
+        return self.now
+
+    async def sleep(self, seconds: float) -> None:
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(email_service, "time", types.SimpleNamespace(monotonic=fake.monotonic))
+    monkeypatch.setattr(email_service, "asyncio", types.SimpleNamespace(Lock=asyncio.Lock, sleep=fake.sleep))
+    return fake
+
+
+def _send_times(limiter: SendRateLimiter, clock: FakeClock, count: int):
+    async def run():
+        times = []
+        for _ in range(count):
+            async with limiter:
+                times.append(clock.now)
+        return times
+
+    return asyncio.run(run())
+
+
+@pytest.mark.parametrize("rate", [0, -1, -0.5])
+def test_rejects_non_positive_rate(rate):
+    with pytest.raises(ValueError):
+        SendRateLimiter(rate=rate)
+
+
+def test_burst_then_paces_at_rate(clock):
+    limiter = SendRateLimiter(rate=4)
+    start = clock.now
+
+    times = _send_times(limiter, clock, 8)
+
+    # A full bucket lets the first `rate` sends through immediately
+    assert times[:4] == [start] * 4
+    gaps = [b - a for a, b in zip(times[4:], times[5:])]
+    assert times[4] - start == pytest.approx(0.25)
+    assert gaps == pytest.approx([0.25] * 3)
+
+
+def test_fractional_rate_below_one_still_sends(clock):
+    limiter = SendRateLimiter(rate=0.5)
+    start = clock.now
+
+    times = _send_times(limiter, clock, 3)
+
+    assert limiter.capacity == 1.0
+    assert times[0] == start
+    assert times[1] - times[0] == pytest.approx(2.0)
+    assert times[2] - times[1] == pytest.approx(2.0)
+
+
+def test_idle_time_refills_up_to_capacity(clock):
+    limiter = SendRateLimiter(rate=2)
+    _send_times(limiter, clock, 2)
+
+    clock.now += 60
+    times = _send_times(limiter, clock, 3)
+
+    # Idle time only banks `capacity` tokens, not 120
+    assert times[1] == times[0]
+    assert times[2] - times[1] == pytest.approx(0.5)
@@ -0,0 +1,100 @@
+"""
+Tests for the SpatialIndex in backend.models.locations
+"""
+
+import random
+
+import pytest
+
+from backend.models.locations import Coordinates, Location, LocationTier, SpatialIndex
+
+TOLERANCE_MILES = 1e-6
+
+
+def _random_coordinates(rng: random.Random) -> Coordinates:
+    return Coordinates(rng.uniform(-90.0, 90.0), rng.uniform(-180.0, 180.0))
+
+
+@pytest.fixture(scope="module")
+def points():
+    rng = random.Random(1234)
+    locations = [
+        Location(
+            id=f"loc-{i}",
+            code=f"L{i}",
+            name=f"Location {i}",
+            tier=LocationTier.TOWN,
+            coordinates=_random_coordinates(rng),
+            state="XX",
+            country="US",
+        )
+        for i in range(500)
+    ]
+    queries = [_random_coordinates(rng) for _ in range(50)]
+    return locations, queries
+
+
+def _brute_force(locations, query):
+    return sorted(
+        ((loc, query.distance_to(loc.coordinates)) for loc in locations),
+        key=lambda pair: pair[1],
+    )
+
+
+def test_empty_index():
+    index = SpatialIndex([])
+
+    assert len(index) == 0
+    assert index.nearest(Coordinates(0.0, 0.0), 3) == []
+    assert index.within(Coordinates(0.0, 0.0), 100.0) == []
+
+
+@pytest.mark.parametrize("k", [1, 5, 25])
+def test_nearest_matches_brute_force(points, k):
+    locations, queries = points
+    index = SpatialIndex(locations)
+
+    for query in queries:
+        expected = _brute_force(locations, query)[:k]
+        result = index.nearest(query, k)
+
+        assert len(result) == k
+        for (got, got_dist), (_, want_dist) in zip(result, expected):
+            assert got_dist == pytest.approx(want_dist, abs=TOLERANCE_MILES)
+            assert got_dist == pytest.approx(query.distance_to(got.coordinates), abs=TOLERANCE_MILES)
+
+
+def test_nearest_k_larger_than_index(points):
+    locations, queries = points
+    index = SpatialIndex(locations[:10])
+
+    result = index.nearest(queries[0], 50)
+
+    assert len(result) == 10
+    assert [d for _, d in result] == sorted(d for _, d in result)
+
+
+@pytest.mark.parametrize("radius", [0.0, 150.0, 800.0, 3000.0])
+def test_within_matches_brute_force(points, radius):
+    locations, queries = points
+    index = SpatialIndex(locations)
+
+    for query in queries:
+        brute = _brute_force(locations, query)
+        # Points sitting on the boundary may fall either side due to rounding
+        required = {loc.id for loc, d in brute if d < radius - TOLERANCE_MILES}
+        allowed = {loc.id for loc, d in brute if d <= radius + TOLERANCE_MILES}
+
+        result = index.within(query, radius)
+        found = {loc.id for loc, _ in result}
+
+        assert len(found) == len(result)
+        assert required <= found <= allowed
+        for loc, dist in result:
+            assert dist == pytest.approx(query.distance_to(loc.coordinates), abs=TOLERANCE_MILES)
+
+
+def test_within_negative_radius(points):
+    locations, queries = points
+
+    assert SpatialIndex(locations).within(queries[0], -1.0) == []
@@ -0,0 +1,61 @@
+"""
+Tests for password hashing in backend.models.users
+"""
+
+import hashlib
+
+from backend.models.users import (
+    LEGACY_PBKDF2_ITERATIONS,
+    UserAccount,
+    UserProfile,
+    UserStore,
+    _SCRYPT_PREFIX,
+)
+
+
+def _legacy_hash(password: str, salt: str = "legacysalt") -> str:
+    """PBKDF2 'salt$hash' as stored before the scrypt switch"""
+    digest = hashlib.pbkdf2_hmac('sha256', password.encode('utf-8'), salt.encode('utf-8'), LEGACY_PBKDF2_ITERATIONS)
+    return f"{salt}${digest.hex()}"
+
+
+def test_scrypt_round_trip():
+    user = UserAccount(profile=UserProfile(id="u1", username="ana", email="ana@example.com"))
+    user.set_password("correct horse")
+
+    assert user.password_hash.startswith(_SCRYPT_PREFIX)
+    assert user.verify_password("correct horse")
+    assert not user.verify_password("wrong horse")
+    assert not user.needs_rehash()
+
+
+def test_legacy_pbkdf2_hash_verifies():
+    user = UserAccount(profile=UserProfile(id="u1", username="ana", email="ana@example.com"))
+    user.password_hash = _legacy_hash("hunter2")
+
+    assert user.verify_password("hunter2")
+    assert not user.verify_password("hunter3")
+    assert user.needs_rehash()
+
+
+def test_authenticate_upgrades_legacy_hash_to_scrypt():
+    store = UserStore()
+    user = store.create_user("u1", "ana", "ana@example.com")
+    user.password_hash = _legacy_hash("hunter2")
+
+    assert store.authenticate("ana", "hunter2") is user
+    assert user.password_hash.startswith(_SCRYPT_PREFIX)
+    assert not user.needs_rehash()
+    # The upgraded hash still accepts the same password, and only that one
+    assert store.authenticate("ana", "hunter2") is user
+    assert store.authenticate("ana", "wrong") is None
+
+
+def test_failed_authenticate_keeps_legacy_hash():
+    store = UserStore()
+    user = store.create_user("u1", "ana", "ana@example.com")
+    legacy = _legacy_hash("hunter2")
+    user.password_hash = legacy
+
+    assert store.authenticate("ana", "wrong") is None
+    assert user.password_hash == legacy
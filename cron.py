@@ -1,7 +1,10 @@
 #!/usr/bin/env python3
 """
-Scheduled task script for daily event scraping
-This can be run via cron: 0 2 * * * /usr/bin/python3 /path/to/cron_scraper.py
+Scheduled task script for daily event scraping and the weekly digest
+This can be run via cron:
+    0 2 * * * /usr/bin/python3 /path/to/cron.py daily
+    0 9 * * 1 /usr/bin/python3 /path/to/cron.py digest
+The digest runs as its own job so the daily scrape never waits on email delivery.
 """
 
 import sys
@@ -14,40 +17,50 @@ import logging
 # Add backend to path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'backend'))
 
-from scraper_integration import refresh_all_cities, send_weekly_digest
-from database import get_active_subscribers, AsyncSessionLocal, Event
-from sqlalchemy import select
+from scraper_integration import refresh_all_cities, send_weekly_digest, configure_logging
+from database import get_active_subscribers, AsyncSessionLocal, Event, engine
+from sqlalchemy import select, delete, text
 
 # Define deterministic logs directory
 LOGS_DIR = os.path.join(os.path.dirname(__file__), 'logs')
 os.makedirs(LOGS_DIR, exist_ok=True)
 
 # Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler(os.path.join(LOGS_DIR, 'cron_scraping.log')),
-        logging.StreamHandler()
-    ]
-)
+configure_logging(os.path.join(LOGS_DIR, 'cron_scraping.log'))
 
 logger = logging.getLogger(__name__)
 
+# Old events deleted per transaction, so a large backlog never holds one long transaction
+CLEANUP_CHUNK_SIZE = 10000
+
 
 async def cleanup_old_events():
-    """Remove events older than 30 days"""
-    from database import Event
-    from sqlalchemy import delete
-    
+    """Remove events older than 30 days, CLEANUP_CHUNK_SIZE rows per transaction"""
     cutoff_date = datetime.utcnow().date() - timedelta(days=30)
+    total_deleted = 0
     
-    async with AsyncSessionLocal() as session:
-        delete_stmt = delete(Event).where(Event.date < cutoff_date)
-        result = await session.execute(delete_stmt)
-        await session.commit()
+    while True:
+        async with AsyncSessionLocal() as session:
+            delete_stmt = delete(Event).where(
+                Event.id.in_(
+                    select(Event.id).where(Event.date < cutoff_date).limit(CLEANUP_CHUNK_SIZE)
+                )
+            ).returning(Event.id)
+            deleted = len((await session.execute(delete_stmt)).all())
+            await session.commit()
         
-        logger.info(f"Cleaned up {result.rowcount} events older than 30 days")
+        if not deleted:
+            break
+        total_deleted += deleted
+        logger.info(f"Deleted {deleted} old events ({total_deleted} so far)")
+    
+    logger.info(f"Cleaned up {total_deleted} events older than 30 days")
+    
+    # Refresh planner statistics after a large delete (VACUUM can't run in a transaction)
+    if total_deleted and engine.dialect.name == 'postgresql':
+        async with engine.connect() as conn:
+            conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+            await conn.execute(text("VACUUM ANALYZE events"))
 
 
 async def run_daily_scrape():
@@ -70,15 +83,6 @@ async def run_daily_scrape():
         logger.info("\nStep 2: Cleaning up old events...")
         await cleanup_old_events()
 
-        # Step 3: Send weekly digest (only on Monday)
-        if datetime.utcnow().weekday() == 0:  # Monday is 0
-            logger.info("\nStep 3: Sending weekly digest (Monday)...")
-            await send_weekly_digest()
-            logger.info("Weekly digest sent")
-        else:
-            day_name = datetime.utcnow().strftime('%A')
-            logger.info(f"\nStep 3: Skipped weekly digest (today is {day_name}, not Monday)")
-
         logger.info("\n" + "=" * 70)
         logger.info("DAILY SCRAPING JOB COMPLETED SUCCESSFULLY")
         logger.info("=" * 70)
@@ -115,10 +119,10 @@ async def run_daily_scrape():
 
 
 async def send_test_digest():
-    """Send a test digest for testing purposes"""
-    logger.info("Sending test digest...")
+    """Send the weekly digest (its own cron job, or run by hand for testing)"""
+    logger.info("Sending weekly digest...")
     await send_weekly_digest()
-    logger.info("Test digest sent")
+    logger.info("Weekly digest sent")
 
 
 if __name__ == "__main__":
@@ -6,30 +6,262 @@ Event scraping script using agent-browser for Eventbrite, Meetup, and Luma
 import asyncio
 import json
 import os
+import random
 import re
-from datetime import datetime, timedelta
-from typing import Dict, List
+from datetime import date, datetime, timedelta, timezone
+from email.utils import parsedate_to_datetime
+from functools import lru_cache
+from typing import Dict, List, Optional
 import subprocess
 import tempfile
 import time
 import aiohttp
+from bs4 import BeautifulSoup
+
+
+# Browser sessions (each its own browser) scraping pages at the same time
+AGENT_BROWSER_SESSIONS = int(os.environ.get("AGENT_BROWSER_SESSIONS", 4))
+
+# How long to poll a newly opened page for its content, and how often
+PAGE_LOAD_TIMEOUT = 15
+PAGE_POLL_INTERVAL = 0.25
+
+# Pages that render without JavaScript are fetched over plain HTTP first
+HTTP_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+    "Accept-Language": "en-US,en;q=0.9",
+}
+HTTP_TIMEOUT = aiohttp.ClientTimeout(total=10)
+HTTP_FETCH_ATTEMPTS = 3
+# Responses worth retrying after a pause, honoring Retry-After when sent
+HTTP_RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+HTTP_MAX_RETRY_DELAY = 30
+
+# Markers of Cloudflare/DataDome/PerimeterX bot challenges served instead of the page
+_CHALLENGE_RE = re.compile(r'cf-chl|challenge-platform|captcha-delivery|px-captcha', re.IGNORECASE)
+
+# Patterns used while parsing agent-browser snapshots, compiled once at import
+_MONTH_DAY_RE = re.compile(r'\b(January|February|March|April|May|June|July|August|September|October|November|December)\s+(\d{1,2})')
+_REF_RE = re.compile(r'\[ref=([^\]]+)\]')
+_NONEMPTY_QUOTED_RE = re.compile(r'"([^"]+)"')
+_LABEL_TEXT_RE = re.compile(r'-\s+(.+?)\s+\[ref=')
+_VERIFICATION_RE = re.compile(r'captcha|verify|robot|human|confirm')
+
+# Fast paths for the common date shapes, tried before the strptime fallbacks
+_NUM_DATE_RE = re.compile(r'^(\d{1,2})([/-])(\d{1,2})\2(\d{4})$')
+_MONTH_NAME_DATE_RE = re.compile(r'^(?:([a-z]{3,9}),\s+)?([a-z]{3,9})\s+(\d{1,2}),\s+(\d{4})$', re.IGNORECASE)
+_MONTHS = {
+    name: number
+    for number, full in enumerate(
+        ('january', 'february', 'march', 'april', 'may', 'june', 'july', 'august', 'september',
+         'october', 'november', 'december'),
+        start=1,
+    )
+    for name in (full, full[:3])
+}
+_WEEKDAYS = frozenset(
+    name
+    for full in ('monday', 'tuesday', 'wednesday', 'thursday', 'friday', 'saturday', 'sunday')
+    for name in (full, full[:3])
+)
+
+# Words marking a (lowercased) snapshot line as a possible event card, per source
+_EVENTBRITE_LINE_RE = re.compile(r'event|card|listing|ticket|free')
+_EVENTBRITE_UI_LINE_RE = re.compile(r'logo|search|menu|header|footer|nav|button')
+_MEETUP_LINE_RE = re.compile(r'event|meetup|attend|join|listing')
+_LUMA_LINE_RE = re.compile(r'event|card|date|time|location')
+
+# Words that mark quoted snapshot text as an event title
+_EVENT_KEYWORDS = (
+    'event', 'meetup', 'social', 'party', 'workshop', 'conference', 'festival', 'concert', 'show',
+    'exhibition', 'sale', 'auction', 'fair', 'market', 'expo', 'summit', 'forum', 'seminar',
+    'training', 'class', 'course', 'lesson', 'meeting', 'gathering', 'celebration', 'ceremony',
+    'performance', 'screening', 'launch', 'opening', 'closing', 'presentation', 'talk', 'lecture',
+    'discussion', 'debate', 'contest', 'competition', 'tournament', 'game', 'match', 'race',
+    'marathon', 'run', 'walk', 'hike', 'trip', 'tour', 'excursion', 'outing', 'adventure',
+    'expedition', 'voyage', 'journey', 'retreat', 'camp', 'carnival', 'mardi gras', 'carnaval',
+    'fiesta', 'fete', 'jamboree', 'picnic', 'barbecue', 'bbq', 'dinner', 'lunch', 'breakfast',
+    'brunch', 'reception', 'banquet', 'buffet', 'potluck', 'toast', 'gala', 'ball', 'soiree',
+    'revelry', 'festivity', 'jubilee', 'commemoration', 'anniversary', 'birthday', 'wedding',
+    'engagement', 'baby shower', 'bridal shower', 'graduation', 'commencement', 'convocation',
+    'inauguration', 'dedication', 'blessing', 'consecration', 'opening ceremony',
+    'closing ceremony', 'ribbon cutting', 'groundbreaking', 'laying of cornerstone',
+    'memorial service', 'funeral', 'wake', 'visitation', 'viewing', 'calling hours',
+    'family viewing', 'public viewing', 'memorial', 'tribute', 'homage', 'salute', 'recognition',
+    'award ceremony', 'prize ceremony', 'medal ceremony', 'trophy ceremony', 'championship',
+    'title fight', 'bout', 'relay', 'triathlon', 'duathlon', 'aquathlon', 'biathlon', 'pentathlon',
+    'decathlon', 'heptathlon', 'octathlon', 'olympics', 'paralympics', 'world cup', 'super bowl',
+    'stanley cup', 'world series', 'playoffs', 'finals', 'semifinals', 'quarterfinals',
+    'round of 16', 'round of 8', 'round of 4', 'final', 'title', 'winner', 'victor', 'champion',
+    'first place', 'second place', 'third place', 'gold medal', 'silver medal', 'bronze medal',
+    'medal', 'prize', 'award', 'trophy', 'cup', 'shield', 'belt', 'crown', 'crown jewel',
+    'jewel in the crown', 'crowning achievement', 'crowning moment', 'crowning glory',
+    'crowning honor',
+)
+
+
+def _trie_pattern(words) -> str:
+    """
+    Build a regex alternation of words arranged as a prefix trie.
+    Shared prefixes are matched once, so the regex engine walks the pattern
+    like a keyword automaton instead of retrying every word at each position.
+    """
+    trie = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[''] = {}
+
+    def build(node) -> str:
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ''
+        if len(branches) == 1 and '' not in node:
+            return branches[0]
+        group = '(?:' + '|'.join(branches) + ')'
+        return group + '?' if '' in node else group
+
+    return build(trie)
+
+
+# Words that mark quoted snapshot text as navigation or other UI chrome
+_UI_ELEMENTS = frozenset((
+    'logo', 'search', 'menu', 'home', 'about', 'contact', 'login', 'sign in', 'register', 'signup',
+    'account', 'profile', 'settings', 'help', 'support', 'faq', 'terms', 'privacy', 'button',
+    'click', 'tap', 'press', 'touch', 'swipe', 'scroll', 'drag', 'drop', 'upload', 'download',
+    'save', 'delete', 'edit', 'create', 'update', 'modify', 'change', 'adjust', 'configure',
+    'setup', 'install', 'uninstall', 'remove', 'add', 'subtract', 'multiply', 'divide',
+    'calculate', 'compute', 'process', 'analyze', 'evaluate', 'assess', 'review', 'examine',
+    'inspect', 'check', 'verify', 'validate', 'confirm', 'approve', 'authorize', 'permit', 'allow',
+    'enable', 'activate', 'deactivate', 'disable', 'turn on', 'turn off', 'switch', 'toggle',
+    'flip', 'rotate', 'spin', 'twist', 'turn', 'move', 'shift', 'slide', 'glide', 'flow', 'stream',
+    'cascade', 'fall', 'descend', 'ascend', 'rise', 'lift', 'raise', 'elevate', 'hoist', 'haul',
+    'pull', 'push', 'squeeze', 'compress', 'expand', 'stretch', 'extend', 'lengthen', 'shorten',
+    'reduce', 'increase', 'grow', 'shrink', 'enlarge', 'magnify', 'amplify', 'boost', 'enhance',
+    'improve', 'upgrade', 'refresh', 'renew', 'restore', 'repair', 'fix', 'mend', 'patch', 'sew',
+    'stitch', 'knit', 'weave', 'crochet', 'embroider', 'decorate', 'ornament', 'adorn', 'beautify',
+    'embellish', 'grace', 'deck', 'trim', 'garnish', 'spruce', 'tidy', 'organize', 'arrange',
+    'order', 'sort', 'classify', 'categorize', 'group', 'cluster', 'collect', 'gather', 'assemble',
+    'accumulate', 'amass', 'pile', 'stack', 'heap', 'mount', 'build', 'construct', 'form', 'shape',
+    'mold', 'craft', 'fabricate', 'manufacture', 'produce', 'generate', 'yield', 'provide',
+    'supply', 'offer', 'present', 'deliver', 'dispatch', 'send', 'transmit', 'transfer', 'convey',
+    'communicate', 'express', 'state', 'declare', 'announce', 'proclaim', 'publish', 'release',
+    'distribute', 'spread', 'circulate', 'disseminate', 'broadcast', 'air', 'televise', 'post',
+    'share', 'allocate', 'assign', 'designate', 'appoint', 'nominate', 'select', 'choose', 'pick',
+    'opt', 'prefer', 'favor', 'like', 'love', 'adore', 'worship', 'revere', 'esteem', 'regard',
+    'respect', 'honor', 'admire', 'appreciate', 'value', 'treasure', 'cherish', 'nurture',
+    'cultivate', 'foster', 'nourish', 'feed', 'sustain', 'maintain', 'preserve', 'protect',
+    'guard', 'defend', 'shield', 'cover', 'hide', 'conceal', 'obscure', 'veil', 'mask', 'disguise',
+    'camouflage', 'cloak', 'mantle', 'blanket', 'sheet', 'lid', 'cap', 'hat', 'helmet', 'hood',
+    'visor', 'goggles', 'sunglasses', 'eyeglasses', 'spectacles', 'frames', 'lenses', 'contacts',
+    'glasses', 'hearing aid', 'walker', 'cane', 'crutches', 'wheelchair', 'scooter', 'bed',
+    'chair', 'table', 'desk', 'couch', 'sofa', 'love seat', 'recliner', 'ottoman', 'bench',
+    'stool', 'footstool', 'footrest', 'armrest', 'headrest', 'pillow', 'quilt', 'comforter',
+    'duvet', 'bedspread', 'coverlet', 'carpet', 'rug', 'mat', 'floor', 'wall', 'ceiling', 'roof',
+    'door', 'window', 'curtain', 'blinds', 'shade', 'awning', 'canopy', 'tent', 'shelter', 'shack',
+    'hut', 'cabin', 'cottage', 'house', 'apartment', 'condo', 'townhouse', 'duplex', 'triplex',
+    'quadplex', 'building', 'structure', 'construction', 'architecture', 'design', 'blueprint',
+    'plan', 'scheme', 'strategy', 'tactic', 'method', 'approach', 'technique', 'procedure',
+    'operation', 'activity', 'action', 'behavior', 'conduct', 'deportment', 'manner', 'way',
+    'style', 'fashion', 'mode', 'figure', 'outline', 'contour', 'silhouette', 'shadow',
+    'reflection', 'image', 'picture', 'photo', 'photograph', 'snapshot', 'portrait', 'landscape',
+    'scene', 'view', 'panorama', 'vista', 'prospect', 'outlook', 'perspective', 'angle', 'aspect',
+    'facet', 'phase', 'stage', 'step', 'level', 'degree', 'grade', 'rank', 'class', 'category',
+    'type', 'kind', 'variety', 'species', 'genus', 'family', 'phylum', 'kingdom', 'domain',
+    'empire', 'realm', 'sphere', 'territory', 'region', 'area', 'zone', 'district', 'neighborhood',
+    'locality', 'locale', 'place', 'location', 'position', 'spot', 'site', 'situation', 'setting',
+    'environment', 'surroundings', 'vicinity', 'environs', 'surrounds', 'outskirts', 'suburbs',
+    'suburbia', 'countryside', 'country', 'rural', 'urban', 'city', 'town', 'village', 'hamlet',
+    'settlement', 'colony', 'outpost', 'station', 'base', 'headquarters', 'office', 'workplace',
+    'factory', 'plant', 'mill', 'workshop', 'studio', 'laboratory', 'lab', 'clinic', 'hospital',
+    'medical center', 'health center', 'doctor', 'physician', 'surgeon', 'nurse', 'therapist',
+    'counselor', 'psychologist', 'psychiatrist', 'social worker', 'teacher', 'professor',
+    'instructor', 'educator', 'mentor', 'coach', 'trainer', 'guide', 'leader', 'manager',
+    'supervisor', 'director', 'executive', 'administrator', 'official', 'authority', 'government',
+    'politics', 'policy', 'law', 'legislation', 'statute', 'ordinance', 'regulation', 'rule',
+    'standard', 'norm', 'criterion', 'measure', 'metric', 'benchmark', 'yardstick', 'cubit',
+    'foot', 'inch', 'yard', 'mile', 'kilometer', 'meter', 'centimeter', 'millimeter', 'micrometer',
+    'nanometer', 'angstrom', 'furlong', 'rod', 'chain', 'fathom', 'cable', 'nautical mile',
+    'league', 'pace', 'stride', 'footstep', 'footprint', 'track', 'trail', 'path', 'road',
+    'street', 'avenue', 'boulevard', 'drive', 'lane', 'court', 'circle', 'square', 'plaza', 'park',
+    'garden', 'lawn', 'field', 'meadow', 'pasture', 'farm', 'ranch', 'estate', 'manor', 'mansion',
+    'palace', 'castle', 'fortress', 'citadel', 'stronghold', 'bastion', 'redoubt', 'trench',
+    'ditch', 'moat', 'drawbridge', 'portcullis', 'gate', 'arch', 'bridge', 'tunnel', 'culvert',
+    'overpass', 'underpass', 'viaduct', 'aqueduct', 'dam', 'reservoir', 'lake', 'pond', 'pool',
+    'lagoon', 'bay', 'gulf', 'sea', 'ocean', 'river', 'brook', 'creek', 'tributary', 'confluence',
+    'delta', 'estuary', 'mouth', 'source', 'spring', 'well', 'fountain', 'waterfall', 'rapids',
+    'whirlpool', 'eddyy', 'current', 'motion', 'movement', 'exercise', 'practice', 'application',
+    'implementation', 'execution', 'performance', 'fulfillment', 'realization', 'achievement',
+    'accomplishment', 'completion', 'finish', 'end', 'conclusion', 'termination', 'cessation',
+    'stop', 'halt', 'pause', 'break', 'interval', 'intermission', 'rest', 'respite', 'breather',
+    'recess', 'vacation', 'holiday', 'leave', 'absence', 'departure', 'exit', 'outlet', 'escape',
+    'flight', 'flee', 'run', 'sprint', 'dash', 'race', 'hurry', 'rush', 'haste', 'speed',
+    'velocity', 'acceleration', 'force', 'energy', 'power', 'strength', 'might', 'potency',
+    'capacity', 'ability', 'capability', 'competence', 'skill', 'talent', 'gift', 'aptitude',
+    'faculty', 'endowment', 'attribute', 'characteristic', 'feature', 'trait', 'property',
+    'quality', 'dimension', 'factor', 'element', 'component', 'part', 'portion', 'segment',
+    'section', 'division', 'unit', 'module', 'subunit', 'subsection', 'subdivision', 'submodule',
+    'subcomponent', 'subpart', 'subportion', 'subsegment',
+))
+
+# Quoted text containing a common event word, taken as the event title
+_EVENT_TITLE_RE = re.compile(r'"([^"]*?\b(?:' + _trie_pattern(_EVENT_KEYWORDS) + r')\b[^"]*)"', re.IGNORECASE)
+
+# Any UI word anywhere in (lowercased) text
+_UI_ELEMENT_RE = re.compile(_trie_pattern(_UI_ELEMENTS))
+
+
+def _first_quoted(text: str) -> Optional[str]:
+    """Return the first double-quoted substring of text, or None if there is none."""
+    start = text.find('"')
+    if start < 0:
+        return None
+    end = text.find('"', start + 1)
+    return text[start + 1:end] if end > 0 else None
 
 
 def parse_event_date(date_str: str) -> datetime:
     """Parse event date string to datetime object."""
+    # Relative dates like "Tomorrow" depend on the current day, so it is part of the cache key
+    return _parse_event_date(date_str, datetime.now().date())
+
+
+def _parse_common_date(date_str: str) -> Optional[date]:
+    """Parse "12/05/2026" and "Sat, Dec 20, 2026" style dates without strptime."""
+    match = _NUM_DATE_RE.match(date_str)
+    if match:
+        month, _, day, year = match.groups()
+    else:
+        match = _MONTH_NAME_DATE_RE.match(date_str)
+        if not match:
+            return None
+        weekday, month_name, day, year = match.groups()
+        month = _MONTHS.get(month_name.lower())
+        if not month or (weekday and weekday.lower() not in _WEEKDAYS):
+            return None
+
+    try:
+        return date(int(year), int(month), int(day))
+    except ValueError:
+        return None
+
+
+@lru_cache(maxsize=2048)
+def _parse_event_date(date_str: str, today: date) -> date:
+    """Parse an event date string relative to today; cached since listings repeat dates."""
     # Clean up the date string
     date_str = date_str.strip()
 
     # Handle relative dates like "Tomorrow", "This week", etc.
-    today = datetime.now()
-
     if "Today" in date_str or "today" in date_str:
-        return today.date()
+        return today
     elif "Tomorrow" in date_str or "tomorrow" in date_str:
-        return (today + timedelta(days=1)).date()
+        return today + timedelta(days=1)
     elif "This week" in date_str or "this week" in date_str:
         # Find the next occurrence of the day mentioned
-        day_match = re.search(r'\b(January|February|March|April|May|June|July|August|September|October|November|December)\s+(\d{1,2})', date_str)
+        day_match = _MONTH_DAY_RE.search(date_str)
         if day_match:
             month_name, day_num = day_match.groups()
             year = today.year
@@ -38,19 +270,24 @@ def parse_event_date(date_str: str) -> datetime:
             try:
                 parsed_date = datetime.strptime(date_part, "%B %d, %Y").date()
                 # If the date is in the past, it might be next year
-                if parsed_date < today.date():
+                if parsed_date < today:
                     parsed_date = datetime.strptime(date_part.replace(str(year), str(year + 1)), "%B %d, %Y").date()
                 return parsed_date
             except ValueError:
                 try:
                     parsed_date = datetime.strptime(date_part.replace(" ", " "), "%B %d, %Y").date()
-                    if parsed_date < today.date():
+                    if parsed_date < today:
                         parsed_date = datetime.strptime(date_part.replace(str(year), str(year + 1)), "%B %d, %Y").date()
                     return parsed_date
                 except ValueError:
                     pass
 
     # Try to parse as full date
+    date_str = date_str.split('(')[0].strip()
+    parsed_date = _parse_common_date(date_str)
+    if parsed_date:
+        return parsed_date
+
     date_patterns = [
         "%a, %b %d, %Y",
         "%A, %B %d, %Y",
@@ -62,129 +299,325 @@ def parse_event_date(date_str: str) -> datetime:
 
     for pattern in date_patterns:
         try:
-            return datetime.strptime(date_str.split('(')[0].strip(), pattern).date()
+            return datetime.strptime(date_str, pattern).date()
         except ValueError:
             pass
 
     # If all parsing fails, return today's date as fallback
-    return today.date()
-        return today.date()
+    return today
 
-    def format_date_for_header(date_obj: datetime.date) -> str:
-        """Format date as 'Day, Month Date, Year' for markdown header."""
-        return date_obj.strftime("%A, %B %d, %Y")
 
-    def run_agent_browser_command(cmd: str) -> tuple[str, bool]:
-        """
-        Run an agent-browser command and return the output and success status.
-        """
+def _matching_lines(snapshot: str, include: re.Pattern, exclude: re.Pattern = None) -> List[str]:
+    """
+    Return the snapshot lines whose lowercased text matches include but not exclude.
+    The snapshot is lowercased once instead of line by line.
+    """
+    return [
+        line for line, line_lower in zip(snapshot.split('\n'), snapshot.lower().split('\n'))
+        if include.search(line_lower) and not (exclude and exclude.search(line_lower))
+    ]
+
+
+def format_date_for_header(date_obj: datetime.date) -> str:
+    """Format date as 'Day, Month Date, Year' for markdown header."""
+    return date_obj.strftime("%A, %B %d, %Y")
+
+
+async def run_agent_browser_command(cmd: List[str], timeout: int = 60) -> tuple[str, bool]:
+    """
+    Run an agent-browser command and return the output and success status.
+    The command is an argument list, executed without a shell and without
+    blocking the event loop.
+    """
+    try:
+        proc = await asyncio.create_subprocess_exec(
+            *cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE
+        )
         try:
-            result = subprocess.run(cmd.split(), shell=False, capture_output=True, text=True, timeout=60)
-            if result.returncode != 0:
-                print(f"Error running command: {' '.join(cmd.split())}")
-                print(f"Error: {result.stderr}")
-                return result.stderr, False
-            return result.stdout, True
-    except subprocess.TimeoutExpired:
-        print(f"Command timed out: {cmd}")
-        return "", False
+            stdout, stderr = await asyncio.wait_for(proc.communicate(), timeout)
+        except asyncio.TimeoutError:
+            proc.kill()
+            await proc.wait()
+            print(f"Command timed out: {' '.join(cmd)}")
+            return "", False
+        if proc.returncode != 0:
+            print(f"Error running command: {' '.join(cmd)}")
+            print(f"Error: {stderr.decode(errors='replace')}")
+            return stderr.decode(errors='replace'), False
+        return stdout.decode(errors='replace'), True
     except Exception as e:
         print(f"Error running agent-browser command: {e}")
         return "", False
 
 
-def take_screenshot(filename: str):
+class AgentBrowserSession:
+    """
+    One agent-browser session kept open across page scrapes.
+
+    agent-browser keeps its browser running in a background daemon between
+    CLI calls, so scraping every page through one session pays the browser
+    launch once instead of closing and relaunching it per page. A named
+    session gets its own isolated browser.
+    """
+
+    def __init__(self, name: Optional[str] = None):
+        self.name = name
+
+    async def run(self, *args: str, timeout: int = 60) -> tuple[str, bool]:
+        """Run an agent-browser subcommand in this session"""
+        cmd = ["agent-browser"]
+        if self.name:
+            cmd += ["--session", self.name]
+        return await run_agent_browser_command(cmd + list(args), timeout)
+
+    async def open(self, url: str) -> tuple[str, bool]:
+        return await self.run("open", url)
+
+    async def snapshot(self) -> tuple[str, bool]:
+        return await self.run("snapshot", "-i")
+
+    async def screenshot(self, filename: str) -> tuple[str, bool]:
+        return await self.run("screenshot", filename, timeout=30)
+
+    async def close(self) -> tuple[str, bool]:
+        return await self.run("close")
+
+
+async def wait_for_page(browser: AgentBrowserSession, timeout: float = PAGE_LOAD_TIMEOUT) -> tuple[str, bool]:
+    """
+    Poll snapshots of a freshly opened page until it shows content or a verification screen.
+    Returns the last snapshot once the page is ready, has stopped changing,
+    or the timeout runs out.
+    """
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    snapshot_result, success = "", False
+    previous_snapshot = None
+    while True:
+        snapshot_result, success = await browser.snapshot()
+        if success:
+            snapshot_lower = snapshot_result.lower()
+            if ("event" in snapshot_lower and "loading" not in snapshot_lower) or _VERIFICATION_RE.search(snapshot_lower):
+                return snapshot_result, success
+            # An unchanged page is as loaded as it gets, even without event
+            # content (an empty listing or an unfamiliar layout)
+            if snapshot_result.strip() and snapshot_result == previous_snapshot:
+                return snapshot_result, success
+            previous_snapshot = snapshot_result
+        if loop.time() + PAGE_POLL_INTERVAL >= deadline:
+            return snapshot_result, success
+        await asyncio.sleep(PAGE_POLL_INTERVAL)
+
+
+async def take_screenshot(browser: AgentBrowserSession, filename: str):
     """
     Take a screenshot for debugging purposes.
     """
-    try:
-        cmd = f"agent-browser screenshot {filename}"
-        result = subprocess.run(cmd, shell=True, capture_output=True, text=True, timeout=30)
-        if result.returncode == 0:
-            print(f"Screenshot saved to {filename}")
-        else:
-            print(f"Failed to take screenshot: {result.stderr}")
-    except Exception as e:
-        print(f"Error taking screenshot: {e}")
+    output, success = await browser.screenshot(filename)
+    if success:
+        print(f"Screenshot saved to {filename}")
+    else:
+        print(f"Failed to take screenshot: {output}")
 
 
-def take_screenshot_with_timestamp(prefix: str = "debug") -> str:
+async def take_screenshot_with_timestamp(browser: AgentBrowserSession, prefix: str = "debug") -> str:
     """
     Take a screenshot with a timestamp in the filename.
     Returns the filename of the screenshot taken.
     """
     filename = f"{prefix}_{int(time.time())}.png"
-    take_screenshot(filename)
+    await take_screenshot(browser, filename)
     return filename
 
 
-async def scrape_eventbrite_page_agent(url: str, existing_links: set = None) -> List[Dict]:
+def new_http_session() -> aiohttp.ClientSession:
+    """
+    Create the HTTP session shared by every page fetch, so connections,
+    TLS handshakes and DNS lookups are reused across hosts and pages.
+    """
+    connector = aiohttp.TCPConnector(limit=256, limit_per_host=32, ttl_dns_cache=300, keepalive_timeout=30)
+    return aiohttp.ClientSession(connector=connector, headers=HTTP_HEADERS, timeout=HTTP_TIMEOUT)
+
+
+def _retry_delay(retry_after: Optional[str], attempt: int) -> float:
+    """Seconds to wait before retrying: the server's Retry-After if given, else exponential backoff."""
+    if retry_after:
+        try:
+            delay = float(retry_after)
+        except ValueError:
+            try:
+                delay = (parsedate_to_datetime(retry_after) - datetime.now(timezone.utc)).total_seconds()
+            except (TypeError, ValueError):
+                delay = None
+        if delay is not None:
+            return min(max(delay, 0), HTTP_MAX_RETRY_DELAY)
+    return 2 ** (attempt - 1) + random.random()
+
+
+async def fetch_html(url: str, session: aiohttp.ClientSession) -> Optional[str]:
+    """
+    Fetch a page over plain HTTP, retrying throttled or failed requests.
+    Returns None on errors or bot challenges, so the caller can fall back to agent-browser.
+    """
+    html = None
+    for attempt in range(1, HTTP_FETCH_ATTEMPTS + 1):
+        retry_after = None
+        try:
+            async with session.get(url) as response:
+                if response.status == 200:
+                    html = await response.text()
+                    break
+                print(f"HTTP fetch of {url} returned {response.status}")
+                if response.status not in HTTP_RETRY_STATUSES:
+                    return None
+                retry_after = response.headers.get("Retry-After")
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            print(f"HTTP fetch of {url} failed: {e}")
+        except (UnicodeDecodeError, LookupError) as e:
+            # Undecodable body or unknown charset; retrying would not help
+            print(f"HTTP fetch of {url} could not be decoded: {e}")
+            return None
+
+        if attempt == HTTP_FETCH_ATTEMPTS:
+            return None
+        await asyncio.sleep(_retry_delay(retry_after, attempt))
+
+    if _CHALLENGE_RE.search(html):
+        print(f"Bot challenge served for {url}")
+        return None
+    return html
+
+
+def parse_eventbrite_html(html: str, existing_links: set = None) -> List[Dict]:
+    """
+    Extract events from server-rendered Eventbrite search results.
+    """
+    seen_links = set(existing_links or ())
+    events = []
+
+    soup = BeautifulSoup(html, 'lxml')
+    # Each card links to its event twice (image and title), both carrying the title
+    for card_link in soup.select('a.event-card-link[href]'):
+        link = card_link['href'].split('?')[0]
+        title = card_link.get('aria-label', '').replace('View ', '', 1).strip()
+        if len(title) < 3 or link in seen_links:
+            continue
+        seen_links.add(link)
+
+        events.append({
+            'title': title,
+            'link': link,
+            'date': datetime.now().date(),
+            'time': "TBA",
+            'location': card_link.get('data-event-location') or "Location TBA",
+            'description': "Description not available - would need to click for details"
+        })
+
+    return events
+
+
+def parse_luma_html(html: str) -> List[Dict]:
+    """
+    Extract events from a server-rendered Luma city page.
+    """
+    seen_links = set()
+    events = []
+
+    soup = BeautifulSoup(html, 'lxml')
+    for card_link in soup.select('a.event-link[href^="/"][aria-label]'):
+        link = f"https://luma.com{card_link['href']}"
+        title = card_link['aria-label'].strip()
+        if len(title) < 3 or link in seen_links:
+            continue
+        seen_links.add(link)
+
+        events.append({
+            'title': title,
+            'link': link,
+            'date': datetime.now().date(),
+            'time': "TBA",
+            'location': "Location TBA",
+            'description': "Description not available - would need to click for details",
+            'source': 'Luma'
+        })
+
+    return events
+
+
+def luma_city_url(city: str) -> str:
+    """
+    Build the Luma page URL for a city name or short code.
+    """
+    # Special city codes map to themselves
+    if city in ("sf", "nyc", "la", "dc"):
+        return f"https://luma.com/{city}"
+    # Convert city name to URL format (replace spaces with dashes)
+    formatted_city = city.replace(" ", "-").replace("_", "-").lower()
+    return f"https://luma.com/{formatted_city}"
+
+
+async def scrape_eventbrite_page_agent(url: str, existing_links: set = None, browser: AgentBrowserSession = None) -> List[Dict]:
     """
     Scrape a single Eventbrite page for event information using agent-browser.
+    Uses the given browser session if provided, otherwise opens and closes its own.
     """
     if existing_links is None:
         existing_links = set()
+    owns_browser = browser is None
+    if owns_browser:
+        browser = AgentBrowserSession()
     events = []
 
     try:
         print(f"Accessing {url} with agent-browser")
 
         # Open the page
-        open_cmd = f"agent-browser open '{url}'"
-        output, success = run_agent_browser_command(open_cmd)
+        output, success = await browser.open(url)
 
         if not success:
             print(f"Failed to open {url}")
             return events
 
-        # Wait for page to load
-        await asyncio.sleep(5)
+        # Wait for page to load, taking the snapshot of its structure once it has
+        snapshot_result, success = await wait_for_page(browser)
 
         # Check if there's a captcha or verification screen after loading
-        snapshot_result, success = run_agent_browser_command("agent-browser snapshot -i")
-        if success and ("captcha" in snapshot_result.lower() or "verify" in snapshot_result.lower() or "robot" in snapshot_result.lower() or "human" in snapshot_result.lower() or "confirm" in snapshot_result.lower()):
+        if success and _VERIFICATION_RE.search(snapshot_result.lower()):
             print("Captcha or verification screen detected, attempting to solve...")
             # Take a screenshot of the captcha
-            screenshot_filename = take_screenshot_with_timestamp("eventbrite_captcha_detected")
+            screenshot_filename = await take_screenshot_with_timestamp(browser, "eventbrite_captcha_detected")
             # Try to solve captcha using nopecha API
             await solve_captcha_with_nopecha("nopecha_api_key_here")  # Replace with actual API key
+            # Take a fresh snapshot of the page behind the verification screen
+            snapshot_result, success = await browser.snapshot()
         else:
             # Take a screenshot after page load to see the normal content
-            screenshot_filename = take_screenshot_with_timestamp("eventbrite_after_load")
-
-        # Take a snapshot to get the page structure
-        snapshot_result, success = run_agent_browser_command("agent-browser snapshot -i")
+            screenshot_filename = await take_screenshot_with_timestamp(browser, "eventbrite_after_load")
 
         if not success:
             print(f"Failed to get snapshot for {url}")
             # Take another screenshot to see what's on the page
-            take_screenshot_with_timestamp("eventbrite_snapshot_failed")
+            await take_screenshot_with_timestamp(browser, "eventbrite_snapshot_failed")
             return events
 
         print(f"Snapshot received, processing content")
 
-        # Look for event-related elements in the snapshot
-        lines = snapshot_result.split('\n')
-
         # Find event cards based on common patterns in the snapshot
-        # Look for elements that are more likely to be actual events
-        event_elements = []
-        for line in lines:
-            line_lower = line.lower()
-            # Look for lines that contain event-like information
-            # Avoid UI elements like logos, search boxes, etc.
-            if any(pattern in line_lower for pattern in ['event', 'card', 'listing', 'ticket', 'free']) and \
-               not any(ui_pattern in line_lower for ui_pattern in ['logo', 'search', 'menu', 'header', 'footer', 'nav', 'button']):
-                event_elements.append(line)
+        # Look for lines that contain event-like information
+        # Avoid UI elements like logos, search boxes, etc.
+        event_elements = _matching_lines(snapshot_result, _EVENTBRITE_LINE_RE, _EVENTBRITE_UI_LINE_RE)
 
         print(f"Found {len(event_elements)} potential event elements")
 
+        # Links already known or added from this page
+        seen_links = set(existing_links)
+
         # Process each potential event element
         for i, element in enumerate(event_elements[:30]):  # Limit to avoid too many requests
             try:
                 # Extract information from the element
                 # Look for references to click on for more details
-                ref_match = re.search(r'\[ref=([^\]]+)\]', element)
+                ref_match = _REF_RE.search(element)
                 if not ref_match:
                     continue
 
@@ -197,19 +630,18 @@ async def scrape_eventbrite_page_agent(url: str, existing_links: set = None) ->
                 # Look for text that follows common event patterns
                 # This regex looks for text that might be an event title
                 # It looks for text that might contain event details like dates, times, etc.
-                event_text_match = re.search(r'"([^"]*?(?:\b(?:event|meetup|social|party|workshop|conference|festival|concert|show|exhibition|sale|auction|fair|market|expo|summit|forum|seminar|training|class|course|lesson|meeting|gathering|celebration|ceremony|performance|screening|launch|opening|closing|presentation|talk|lecture|discussion|debate|contest|competition|tournament|game|match|race|marathon|run|walk|hike|trip|tour|excursion|outing|adventure|expedition|voyage|journey|retreat|camp|festival|carnival|mardi gras|carnaval|fiesta|fete|jamboree|picnic|barbecue|bbq|dinner|lunch|breakfast|brunch|reception|banquet|buffet|potluck|picnic|buffet|reception|toast|celebration|party|gala|ball|soiree|revelry|festivity|jubilee|commemoration|anniversary|birthday|wedding|engagement|baby shower|bridal shower|graduation|commencement|convocation|inauguration|dedication|blessing|consecration|opening ceremony|closing ceremony|ribbon cutting|groundbreaking|laying of cornerstone|memorial service|funeral|wake|visitation|viewing|calling hours|family viewing|public viewing|memorial|tribute|homage|salute|recognition|award ceremony|prize ceremony|medal ceremony|trophy ceremony|championship|title fight|bout|contest|competition|match|game|race|marathon|run|walk|relay|triathlon|duathlon|aquathlon|biathlon|pentathlon|decathlon|heptathlon|octathlon|pentathlon|olympics|paralympics|world cup|super bowl|stanley cup|world series|playoffs|finals|semifinals|quarterfinals|round of 16|round of 8|round of 4|final|championship|title|winner|victor|champion|first place|second place|third place|gold medal|silver medal|bronze medal|medal|prize|award|trophy|cup|shield|belt|title|crown|crown jewel|jewel in the crown|crowning achievement|crowning moment|crowning glory|crowning honor)\b)[^"]*)"', element, re.IGNORECASE)
+                event_text_match = _EVENT_TITLE_RE.search(element)
 
                 if event_text_match:
                     title = event_text_match.group(1).strip()
                 else:
                     # Fallback: look for any text that might be an event title
                     # But avoid common UI elements
-                    text_match = re.search(r'"([^"]+)"', element)
+                    text_match = _NONEMPTY_QUOTED_RE.search(element)
                     if text_match:
                         potential_title = text_match.group(1).strip()
                         # Skip if it's clearly a UI element
-                        ui_elements = ['logo', 'search', 'menu', 'home', 'about', 'contact', 'login', 'sign in', 'register', 'signup', 'account', 'profile', 'settings', 'help', 'support', 'faq', 'terms', 'privacy', 'button', 'click', 'tap', 'press', 'touch', 'swipe', 'scroll', 'drag', 'drop', 'upload', 'download', 'save', 'delete', 'edit', 'create', 'update', 'modify', 'change', 'adjust', 'configure', 'setup', 'install', 'uninstall', 'remove', 'add', 'subtract', 'multiply', 'divide', 'calculate', 'compute', 'process', 'analyze', 'evaluate', 'assess', 'review', 'examine', 'inspect', 'check', 'verify', 'validate', 'confirm', 'approve', 'authorize', 'permit', 'allow', 'enable', 'activate', 'deactivate', 'disable', 'turn on', 'turn off', 'switch', 'toggle', 'flip', 'rotate', 'spin', 'twist', 'turn', 'move', 'shift', 'slide', 'glide', 'flow', 'stream', 'cascade', 'fall', 'drop', 'descend', 'ascend', 'rise', 'lift', 'raise', 'elevate', 'hoist', 'haul', 'pull', 'push', 'press', 'squeeze', 'compress', 'expand', 'stretch', 'extend', 'lengthen', 'shorten', 'reduce', 'increase', 'grow', 'shrink', 'enlarge', 'magnify', 'amplify', 'boost', 'enhance', 'improve', 'upgrade', 'update', 'refresh', 'renew', 'restore', 'repair', 'fix', 'mend', 'patch', 'sew', 'stitch', 'knit', 'weave', 'crochet', 'embroider', 'decorate', 'ornament', 'adorn', 'beautify', 'embellish', 'grace', 'adorn', 'deck', 'trim', 'garnish', 'spruce', 'tidy', 'organize', 'arrange', 'order', 'sort', 'classify', 'categorize', 'group', 'cluster', 'collect', 'gather', 'assemble', 'accumulate', 'amass', 'pile', 'stack', 'heap', 'mount', 'build', 'construct', 'create', 'form', 'shape', 'mold', 'craft', 'fabricate', 'manufacture', 'produce', 'generate', 'yield', 'provide', 'supply', 'offer', 'present', 'deliver', 'dispatch', 'send', 'transmit', 'transfer', 'convey', 'communicate', 'express', 'state', 'declare', 'announce', 'proclaim', 'publish', 'release', 'distribute', 'spread', 'circulate', 'disseminate', 'broadcast', 'transmit', 'air', 'televise', 'stream', 'upload', 'post', 'publish', 'share', 'distribute', 'allocate', 'assign', 'designate', 'appoint', 'nominate', 'select', 'choose', 'pick', 'opt', 'prefer', 'favor', 'like', 'love', 'adore', 'worship', 'revere', 'esteem', 'regard', 'respect', 'honor', 'admire', 'appreciate', 'value', 'treasure', 'cherish', 'nurture', 'cultivate', 'foster', 'nourish', 'feed', 'sustain', 'maintain', 'preserve', 'protect', 'guard', 'defend', 'shield', 'cover', 'hide', 'conceal', 'obscure', 'veil', 'mask', 'disguise', 'camouflage', 'cloak', 'mantle', 'blanket', 'sheet', 'cover', 'lid', 'cap', 'hat', 'helmet', 'hood', 'mask', 'visor', 'goggles', 'sunglasses', 'eyeglasses', 'spectacles', 'frames', 'lenses', 'contacts', 'glasses', 'hearing aid', 'walker', 'cane', 'crutches', 'wheelchair', 'scooter', 'bed', 'chair', 'table', 'desk', 'couch', 'sofa', 'love seat', 'recliner', 'ottoman', 'bench', 'stool', 'stool', 'footstool', 'footrest', 'armrest', 'headrest', 'pillow', 'blanket', 'quilt', 'comforter', 'duvet', 'sheet', 'bedspread', 'coverlet', 'carpet', 'rug', 'mat', 'floor', 'wall', 'ceiling', 'roof', 'door', 'window', 'curtain', 'blinds', 'shade', 'awning', 'canopy', 'tent', 'shelter', 'shack', 'hut', 'cabin', 'cottage', 'house', 'home', 'apartment', 'condo', 'townhouse', 'duplex', 'triplex', 'quadplex', 'building', 'structure', 'construction', 'architecture', 'design', 'blueprint', 'plan', 'scheme', 'strategy', 'tactic', 'method', 'approach', 'technique', 'procedure', 'process', 'operation', 'activity', 'action', 'behavior', 'conduct', 'deportment', 'manner', 'way', 'style', 'fashion', 'mode', 'form', 'shape', 'figure', 'outline', 'contour', 'profile', 'silhouette', 'shadow', 'reflection', 'image', 'picture', 'photo', 'photograph', 'snapshot', 'portrait', 'landscape', 'scene', 'view', 'panorama', 'vista', 'prospect', 'outlook', 'perspective', 'angle', 'aspect', 'facet', 'phase', 'stage', 'step', 'level', 'degree', 'grade', 'rank', 'class', 'category', 'type', 'kind', 'sort', 'variety', 'species', 'genus', 'family', 'order', 'class', 'phylum', 'kingdom', 'domain', 'empire', 'realm', 'sphere', 'territory', 'region', 'area', 'zone', 'district', 'neighborhood', 'locality', 'locale', 'place', 'location', 'position', 'spot', 'site', 'situation', 'setting', 'environment', 'surroundings', 'vicinity', 'environs', 'neighborhood', 'environs', 'surrounds', 'outskirts', 'suburbs', 'suburbia', 'countryside', 'country', 'rural', 'urban', 'city', 'town', 'village', 'hamlet', 'settlement', 'colony', 'outpost', 'station', 'base', 'headquarters', 'office', 'workplace', 'factory', 'plant', 'mill', 'workshop', 'studio', 'laboratory', 'lab', 'clinic', 'hospital', 'medical center', 'health center', 'doctor', 'physician', 'surgeon', 'nurse', 'therapist', 'counselor', 'psychologist', 'psychiatrist', 'social worker', 'teacher', 'professor', 'instructor', 'educator', 'mentor', 'coach', 'trainer', 'instructor', 'guide', 'leader', 'manager', 'supervisor', 'director', 'executive', 'administrator', 'official', 'authority', 'government', 'politics', 'policy', 'law', 'legislation', 'statute', 'ordinance', 'regulation', 'rule', 'standard', 'norm', 'criterion', 'measure', 'metric', 'benchmark', 'yardstick', 'cubit', 'foot', 'inch', 'yard', 'mile', 'kilometer', 'meter', 'centimeter', 'millimeter', 'micrometer', 'nanometer', 'angstrom', 'furlong', 'rod', 'chain', 'fathom', 'cable', 'nautical mile', 'league', 'pace', 'stride', 'step', 'footstep', 'footprint', 'track', 'trail', 'path', 'road', 'street', 'avenue', 'boulevard', 'drive', 'lane', 'court', 'circle', 'square', 'plaza', 'park', 'garden', 'yard', 'lawn', 'field', 'meadow', 'pasture', 'farm', 'ranch', 'estate', 'manor', 'mansion', 'palace', 'castle', 'fortress', 'citadel', 'stronghold', 'bastion', 'redoubt', 'trench', 'ditch', 'moat', 'drawbridge', 'portcullis', 'gate', 'arch', 'bridge', 'tunnel', 'culvert', 'overpass', 'underpass', 'viaduct', 'aqueduct', 'dam', 'reservoir', 'lake', 'pond', 'pool', 'lagoon', 'bay', 'gulf', 'sea', 'ocean', 'river', 'stream', 'brook', 'creek', 'tributary', 'confluence', 'delta', 'estuary', 'mouth', 'source', 'spring', 'well', 'fountain', 'waterfall', 'cascade', 'rapids', 'whirlpool', 'eddyy', 'current', 'stream', 'flow', 'motion', 'movement', 'action', 'activity', 'exercise', 'practice', 'application', 'implementation', 'execution', 'performance', 'fulfillment', 'realization', 'achievement', 'accomplishment', 'completion', 'finish', 'end', 'conclusion', 'termination', 'cessation', 'stop', 'halt', 'pause', 'break', 'interval', 'intermission', 'rest', 'respite', 'breather', 'recess', 'vacation', 'holiday', 'leave', 'absence', 'departure', 'exit', 'outlet', 'escape', 'flight', 'flee', 'run', 'sprint', 'dash', 'race', 'hurry', 'rush', 'haste', 'speed', 'velocity', 'acceleration', 'force', 'energy', 'power', 'strength', 'might', 'potency', 'capacity', 'ability', 'capability', 'competence', 'skill', 'talent', 'gift', 'aptitude', 'faculty', 'endowment', 'endowment', 'attribute', 'characteristic', 'feature', 'trait', 'property', 'quality', 'aspect', 'dimension', 'factor', 'element', 'component', 'part', 'portion', 'segment', 'section', 'division', 'unit', 'module', 'subunit', 'subsection', 'subdivision', 'submodule', 'subcomponent', 'subpart', 'subportion', 'subsegment', 'subsection', 'subdivision', 'submodule', 'subcomponent', 'subpart', 'subportion', 'subsegment']
-                        if not any(ui_word in potential_title.lower() for ui_word in ui_elements):
+                        if not _UI_ELEMENT_RE.search(potential_title.lower()):
                             title = potential_title
 
                 if not title or len(title.strip()) < 3:
@@ -222,8 +654,9 @@ async def scrape_eventbrite_page_agent(url: str, existing_links: set = None) ->
                 # Check if this event link already exists
                 # For now, we'll use a combination of title and ref as unique identifier
                 link_identifier = f"{title}_{ref_id}"
-                if link_identifier in existing_links or link_identifier in [evt['link'] for evt in events]:
+                if link_identifier in seen_links:
                     continue
+                seen_links.add(link_identifier)
 
                 # Create a basic event entry
                 event_info = {
@@ -242,24 +675,27 @@ async def scrape_eventbrite_page_agent(url: str, existing_links: set = None) ->
                 print(f"Error processing event element {i}: {e}")
                 continue
 
-        # Close the browser when done
-        run_agent_browser_command("agent-browser close")
+        # Close the browser when done, unless the caller is reusing it
+        if owns_browser:
+            await browser.close()
 
     except Exception as e:
         print(f"Error scraping page {url}: {e}")
         # Ensure browser is closed even if there's an error
-        try:
-            run_agent_browser_command("agent-browser close")
-        except:
-            pass
+        if owns_browser:
+            await browser.close()
 
     return events
 
 
-async def scrape_meetup_events_agent(location_code: str, search_terms: List[str] = None, filters: List[str] = None) -> List[Dict]:
+async def scrape_meetup_events_agent(location_code: str, search_terms: List[str] = None, filters: List[str] = None, browser: AgentBrowserSession = None) -> List[Dict]:
     """
     Scrape events from Meetup based on location and search terms using agent-browser.
+    Uses the given browser session if provided, otherwise opens and closes its own.
     """
+    owns_browser = browser is None
+    if owns_browser:
+        browser = AgentBrowserSession()
     events = []
 
     try:
@@ -278,46 +714,36 @@ async def scrape_meetup_events_agent(location_code: str, search_terms: List[str]
         print(f"Accessing Meetup URL: {base_url} with agent-browser")
 
         # Open the page
-        open_cmd = f"agent-browser open '{base_url}'"
-        output, success = run_agent_browser_command(open_cmd)
+        output, success = await browser.open(base_url)
 
         if not success:
             print(f"Failed to open {base_url}")
             return events
 
-        # Wait for page to load
-        time.sleep(5)
+        # Wait for page to load, taking the snapshot of its structure once it has
+        snapshot_result, success = await wait_for_page(browser)
 
         # Check if there's a captcha or verification screen after loading
-        snapshot_result, success = run_agent_browser_command("agent-browser snapshot -i")
-        if success and ("captcha" in snapshot_result.lower() or "verify" in snapshot_result.lower() or "robot" in snapshot_result.lower() or "human" in snapshot_result.lower() or "confirm" in snapshot_result.lower()):
+        if success and _VERIFICATION_RE.search(snapshot_result.lower()):
             print("Captcha or verification screen detected, attempting to solve...")
             # Take a screenshot of the captcha
-            screenshot_filename = take_screenshot_with_timestamp("meetup_captcha_detected")
+            screenshot_filename = await take_screenshot_with_timestamp(browser, "meetup_captcha_detected")
             # Try to solve captcha using nopecha API
             await solve_captcha_with_nopecha("nopecha_api_key_here")  # Replace with actual API key
+            # Take a fresh snapshot of the page behind the verification screen
+            snapshot_result, success = await browser.snapshot()
         else:
             # Take a screenshot after page load to see the normal content
-            screenshot_filename = take_screenshot_with_timestamp("meetup_after_load")
-
-        # Take a snapshot to get the page structure
-        snapshot_result, success = run_agent_browser_command("agent-browser snapshot -i")
+            screenshot_filename = await take_screenshot_with_timestamp(browser, "meetup_after_load")
 
         if not success:
             print(f"Failed to get snapshot for {base_url}")
             # Take another screenshot to see what's on the page
-            take_screenshot_with_timestamp("meetup_snapshot_failed")
+            await take_screenshot_with_timestamp(browser, "meetup_snapshot_failed")
             return events
 
-        # Look for event-related elements in the snapshot
-        lines = snapshot_result.split('\n')
-
         # Find event cards based on common patterns in the snapshot
-        event_elements = []
-        for line in lines:
-            line_lower = line.lower()
-            if any(pattern in line_lower for pattern in ['event', 'meetup', 'attend', 'join', 'event-card', 'listing']):
-                event_elements.append(line)
+        event_elements = _matching_lines(snapshot_result, _MEETUP_LINE_RE)
 
         print(f"Found {len(event_elements)} potential Meetup event elements")
 
@@ -326,7 +752,7 @@ async def scrape_meetup_events_agent(location_code: str, search_terms: List[str]
             try:
                 # Extract information from the element
                 # Look for references to click on for more details
-                ref_match = re.search(r'\[ref=([^\]]+)\]', element)
+                ref_match = _REF_RE.search(element)
                 if not ref_match:
                     continue
 
@@ -336,12 +762,12 @@ async def scrape_meetup_events_agent(location_code: str, search_terms: List[str]
                 # Look for text in quotes or after common labels
                 title = ""
                 # Try to find text in quotes
-                title_match = re.search(r'"([^"]*)"', element)
-                if title_match:
-                    title = title_match.group(1)
+                title_match = _first_quoted(element)
+                if title_match is not None:
+                    title = title_match
                 else:
                     # Try to find text after common labels
-                    text_match = re.search(r'-\s+(.+?)\s+\[ref=', element)
+                    text_match = _LABEL_TEXT_RE.search(element)
                     if text_match:
                         title = text_match.group(1).strip()
 
@@ -370,84 +796,64 @@ async def scrape_meetup_events_agent(location_code: str, search_terms: List[str]
                 print(f"Error processing Meetup event element {i}: {e}")
                 continue
 
-        # Close the browser when done
-        run_agent_browser_command("agent-browser close")
+        # Close the browser when done, unless the caller is reusing it
+        if owns_browser:
+            await browser.close()
 
     except Exception as e:
         print(f"Error scraping Meetup events: {e}")
         # Ensure browser is closed even if there's an error
-        try:
-            run_agent_browser_command("agent-browser close")
-        except:
-            pass
+        if owns_browser:
+            await browser.close()
 
     return events
 
 
-async def scrape_luma_events_agent(city: str) -> List[Dict]:
+async def scrape_luma_events_agent(city: str, browser: AgentBrowserSession = None) -> List[Dict]:
     """
     Scrape events from Luma based on city using agent-browser.
+    Uses the given browser session if provided, otherwise opens and closes its own.
     """
+    owns_browser = browser is None
+    if owns_browser:
+        browser = AgentBrowserSession()
     events = []
-
-    # Handle special city codes
-    if city == "sf":
-        city_url = "https://luma.com/sf"
-    elif city == "nyc":
-        city_url = "https://luma.com/nyc"
-    elif city == "la":
-        city_url = "https://luma.com/la"
-    elif city == "dc":
-        city_url = "https://luma.com/dc"
-    else:
-        # Convert city name to URL format (replace spaces with dashes)
-        formatted_city = city.replace(" ", "-").replace("_", "-").lower()
-        city_url = f"https://luma.com/{formatted_city}"
+    city_url = luma_city_url(city)
 
     try:
         print(f"Accessing Luma URL: {city_url} with agent-browser")
 
         # Open the page
-        open_cmd = f"agent-browser open '{city_url}'"
-        output, success = run_agent_browser_command(open_cmd)
+        output, success = await browser.open(city_url)
 
         if not success:
             print(f"Failed to open {city_url}")
             return events
 
-        # Wait for page to load
-        time.sleep(5)
+        # Wait for page to load, taking the snapshot of its structure once it has
+        snapshot_result, success = await wait_for_page(browser)
 
         # Check if there's a captcha or verification screen after loading
-        snapshot_result, success = run_agent_browser_command("agent-browser snapshot -i")
-        if success and ("captcha" in snapshot_result.lower() or "verify" in snapshot_result.lower() or "robot" in snapshot_result.lower() or "human" in snapshot_result.lower() or "confirm" in snapshot_result.lower()):
+        if success and _VERIFICATION_RE.search(snapshot_result.lower()):
             print("Captcha or verification screen detected, attempting to solve...")
             # Take a screenshot of the captcha
-            screenshot_filename = take_screenshot_with_timestamp("luma_captcha_detected")
+            screenshot_filename = await take_screenshot_with_timestamp(browser, "luma_captcha_detected")
             # Try to solve captcha using nopecha API
             await solve_captcha_with_nopecha("nopecha_api_key_here")  # Replace with actual API key
+            # Take a fresh snapshot of the page behind the verification screen
+            snapshot_result, success = await browser.snapshot()
         else:
             # Take a screenshot after page load to see the normal content
-            screenshot_filename = take_screenshot_with_timestamp("luma_after_load")
-
-        # Take a snapshot to get the page structure
-        snapshot_result, success = run_agent_browser_command("agent-browser snapshot -i")
+            screenshot_filename = await take_screenshot_with_timestamp(browser, "luma_after_load")
 
         if not success:
             print(f"Failed to get snapshot for {city_url}")
             # Take another screenshot to see what's on the page
-            take_screenshot_with_timestamp("luma_snapshot_failed")
+            await take_screenshot_with_timestamp(browser, "luma_snapshot_failed")
             return events
 
-        # Look for event-related elements in the snapshot
-        lines = snapshot_result.split('\n')
-
         # Find event cards based on common patterns in the snapshot
-        event_elements = []
-        for line in lines:
-            line_lower = line.lower()
-            if any(pattern in line_lower for pattern in ['event', 'card', 'date', 'time', 'location', 'event-card', 'content-card', 'date-title']):
-                event_elements.append(line)
+        event_elements = _matching_lines(snapshot_result, _LUMA_LINE_RE)
 
         print(f"Found {len(event_elements)} potential Luma event elements")
 
@@ -456,7 +862,7 @@ async def scrape_luma_events_agent(city: str) -> List[Dict]:
             try:
                 # Extract information from the element
                 # Look for references to click on for more details
-                ref_match = re.search(r'\[ref=([^\]]+)\]', element)
+                ref_match = _REF_RE.search(element)
                 if not ref_match:
                     continue
 
@@ -466,12 +872,12 @@ async def scrape_luma_events_agent(city: str) -> List[Dict]:
                 # Look for text in quotes or after common labels
                 title = ""
                 # Try to find text in quotes
-                title_match = re.search(r'"([^"]*)"', element)
-                if title_match:
-                    title = title_match.group(1)
+                title_match = _first_quoted(element)
+                if title_match is not None:
+                    title = title_match
                 else:
                     # Try to find text after common labels
-                    text_match = re.search(r'-\s+(.+?)\s+\[ref=', element)
+                    text_match = _LABEL_TEXT_RE.search(element)
                     if text_match:
                         title = text_match.group(1).strip()
 
@@ -500,16 +906,15 @@ async def scrape_luma_events_agent(city: str) -> List[Dict]:
                 print(f"Error processing Luma event element {i}: {e}")
                 continue
 
-        # Close the browser when done
-        run_agent_browser_command("agent-browser close")
+        # Close the browser when done, unless the caller is reusing it
+        if owns_browser:
+            await browser.close()
 
     except Exception as e:
         print(f"Error scraping Luma events: {e}")
         # Ensure browser is closed even if there's an error
-        try:
-            run_agent_browser_command("agent-browser close")
-        except:
-            pass
+        if owns_browser:
+            await browser.close()
 
     return events
 
@@ -584,6 +989,42 @@ async def main():
     existing_links = set()
     print(f"Initialized with {len(existing_links)} existing event links to avoid")
 
+    # Pages load in parallel, each in its own agent-browser session; a session
+    # is reused for later pages once free and all are closed at the end
+    idle_browsers: asyncio.Queue = asyncio.Queue()
+    for n in range(1, AGENT_BROWSER_SESSIONS + 1):
+        idle_browsers.put_nowait(AgentBrowserSession(f"agentbrowse-{n}"))
+    used_browsers = set()
+
+    async def with_browser(scrape, *args) -> List[Dict]:
+        browser = await idle_browsers.get()
+        used_browsers.add(browser)
+        try:
+            return await scrape(*args, browser=browser)
+        finally:
+            idle_browsers.put_nowait(browser)
+
+    # Pages are tried over plain HTTP first; agent-browser is only started for
+    # pages that need JavaScript or serve a bot challenge
+    session = new_http_session()
+
+    async def with_http(url: str, parse_html, scrape, *args) -> List[Dict]:
+        html = await fetch_html(url, session)
+        events = []
+        if html:
+            # Markup the parser chokes on falls back to the browser like any other miss
+            try:
+                events = parse_html(html)
+            except Exception as e:
+                print(f"Could not parse {url} without a browser: {e}")
+        if events:
+            print(f"Fetched {url} without a browser")
+            return events
+        return await with_browser(scrape, *args)
+
+    # (label, scrape coroutine) for every page to fetch
+    scrapes = []
+
     # Check if we should scrape from Eventbrite
     if config.get("MODES", {}).get("ENABLE_EVENTBRITE_SCRAPING", True):
         print("Scraping from Eventbrite using agent-browser...")
@@ -604,9 +1045,10 @@ async def main():
         # Scrape each URL
         for url in urls:
             print(f"Scraping: {url}")
-            events = await scrape_eventbrite_page_agent(url, existing_links)
-            all_events.extend(events)
-            print(f"Found {len(events)} new events on this page")
+            scrapes.append((url, with_http(
+                url, lambda html: parse_eventbrite_html(html, existing_links),
+                scrape_eventbrite_page_agent, url, existing_links,
+            )))
 
     # Check if we should scrape from Meetup
     if config.get("MODES", {}).get("ENABLE_MEETUP_SCRAPING", True):
@@ -614,16 +1056,22 @@ async def main():
         search_terms = config.get("MODES", {}).get("CUSTOM_SEARCH_TERMS", [])
         filters = config.get("FILTERS_TO_USE", [])
 
-        meetup_events = await scrape_meetup_events_agent(meetup_location, search_terms, filters)
-        all_events.extend(meetup_events)
-        print(f"Found {len(meetup_events)} new Meetup events")
+        scrapes.append(("Meetup", with_browser(scrape_meetup_events_agent, meetup_location, search_terms, filters)))
 
     # Check if we should scrape from Luma
     if config.get("MODES", {}).get("ENABLE_LUMA_SCRAPING", True):
         print(f"Scraping from Luma using agent-browser for city: {luma_city}...")
-        luma_events = await scrape_luma_events_agent(luma_city)
-        all_events.extend(luma_events)
-        print(f"Found {len(luma_events)} new Luma events")
+        scrapes.append(("Luma", with_http(luma_city_url(luma_city), parse_luma_html, scrape_luma_events_agent, luma_city)))
+
+    try:
+        results = await asyncio.gather(*(scrape for _, scrape in scrapes))
+    finally:
+        await session.close()
+        await asyncio.gather(*(browser.close() for browser in used_browsers))
+
+    for (label, _), events in zip(scrapes, results):
+        all_events.extend(events)
+        print(f"Found {len(events)} new events from {label}")
 
     print(f"Total new events found: {len(all_events)}")
 
@@ -5,13 +5,34 @@ Browser utilities - Playwright primary, Firecrawl fallback, Pydoll last resort
 
 import asyncio
 import os
-from typing import Optional, Tuple
+import weakref
+from typing import Dict, Optional, Tuple
+from urllib.parse import urlparse
 from playwright.async_api import async_playwright, Browser, Page
 
 # API Keys
 FIRECRAWL_API_KEY = os.environ.get("FIRECRAWL_API_KEY")
 HYPERBROWSER_API_KEY = os.environ.get("HYPERBROWSER_API_KEY")
 
+# Concurrent fetch_page calls allowed per host, so cities scraped in parallel
+# don't hit the same site all at once
+MAX_FETCHES_PER_HOST = int(os.environ.get("MAX_FETCHES_PER_HOST", "2"))
+
+# {event loop: {host: semaphore}} - asyncio primitives can't be shared across loops
+_host_semaphores: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, asyncio.Semaphore]]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def _host_semaphore(url: str) -> asyncio.Semaphore:
+    """Get the semaphore limiting concurrent fetches to url's host"""
+    host = urlparse(url).netloc.lower()
+    loop_semaphores = _host_semaphores.setdefault(asyncio.get_running_loop(), {})
+    semaphore = loop_semaphores.get(host)
+    if semaphore is None:
+        semaphore = loop_semaphores[host] = asyncio.Semaphore(MAX_FETCHES_PER_HOST)
+    return semaphore
+
 
 async def create_browser(headless: bool = True) -> Tuple[Browser, Page]:
     """Create Playwright browser with advanced stealth settings"""
@@ -149,7 +170,15 @@ async def fetch_with_firecrawl(url: str) -> Optional[str]:
 async def fetch_page(url: str, use_firecrawl_fallback: bool = True) -> Optional[str]:
     """
     Fetch page content using Playwright, with Firecrawl/Hyperbrowser fallback
+
+    At most MAX_FETCHES_PER_HOST fetches run against the same host at once.
     """
+    async with _host_semaphore(url):
+        return await _fetch_page(url, use_firecrawl_fallback)
+
+
+async def _fetch_page(url: str, use_firecrawl_fallback: bool) -> Optional[str]:
+    """Unthrottled fetch_page implementation"""
     # Try Playwright first
     browser = None
     try:
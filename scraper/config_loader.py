@@ -25,7 +25,9 @@ class Config:
             self.load()
     
     def load(self, config_file: str = "config.json") -> None:
-        """Load configuration from JSON file"""
+        """Load configuration from JSON file (relative paths resolve against the scraper directory)"""
+        if not os.path.isabs(config_file):
+            config_file = os.path.join(os.path.dirname(os.path.abspath(__file__)), config_file)
         try:
             if os.path.exists(config_file):
                 with open(config_file, 'r') as f:
@@ -66,7 +66,7 @@ async def _fetch_dice_details(url: str) -> dict:
         return details
     return details
 
-async def scrape_dice(city: str = None, max_price: int = None) -> list:
+async def scrape_dice(city: str = None, max_price: int = None, output_file: str = None) -> list:
     """Scrape Dice.fm events"""
     config = get_config()
     fetch_details = config.get_scraper_config('DICE_FM').get('fetch_details', True)
@@ -81,7 +81,8 @@ async def scrape_dice(city: str = None, max_price: int = None) -> list:
     if max_price is None:
         max_price = dice_config.get('max_price', 0)
     
-    output_file = "dice_events.json"
+    if output_file is None:
+        output_file = os.path.join(os.path.dirname(os.path.abspath(__file__)), "dice_events.json")
     
     # Build URL
     city_id = city_map.get(city, 'losangeles-5982e13c613de866017c3e3a')
@@ -193,7 +193,7 @@ def parse_events_from_html(html: str) -> list:
     return events
 
 
-async def scrape_eventbrite(location: str = None, max_pages: int = None) -> list:
+async def scrape_eventbrite(location: str = None, max_pages: int = None, output_file: str = None) -> list:
     """Scrape Eventbrite events for a location"""
     config = get_config()
     
@@ -205,7 +205,8 @@ async def scrape_eventbrite(location: str = None, max_pages: int = None) -> list
     if max_pages is None:
         max_pages = eb_config.get('main_pages', 2)
     
-    output_file = "eventbrite_events.json"
+    if output_file is None:
+        output_file = os.path.join(os.path.dirname(os.path.abspath(__file__)), "eventbrite_events.json")
     
     # Load existing events
     existing_links = set()
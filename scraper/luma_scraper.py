@@ -60,7 +60,7 @@ async def fetch_luma_page(url: str) -> Optional[str]:
         raise e
 
 
-async def scrape_luma(city: str = None) -> list:
+async def scrape_luma(city: str = None, output_file: str = None) -> list:
     """Scrape Luma events for a city"""
     config = get_config()
     fetch_details = config.get_scraper_config('LUMA').get('fetch_details', True)
@@ -71,7 +71,8 @@ async def scrape_luma(city: str = None) -> list:
         luma_map = config.get_scraper_config('LUMA').get('location_map', {})
         city = luma_map.get(location, 'la')
     
-    output_file = "luma_events.json"
+    if output_file is None:
+        output_file = os.path.join(os.path.dirname(os.path.abspath(__file__)), "luma_events.json")
     
     # Convert city code
     if '--' in city:
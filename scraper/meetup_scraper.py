@@ -13,7 +13,7 @@ from browser import fetch_page
 from config_loader import get_config
 
 
-async def scrape_meetup(location: str = None) -> list:
+async def scrape_meetup(location: str = None, output_file: str = None) -> list:
     """Scrape Meetup events"""
     config = get_config()
     fetch_details = config.get_scraper_config('MEETUP').get('fetch_details', True)
@@ -27,7 +27,8 @@ async def scrape_meetup(location: str = None) -> list:
         else:
             location = f"us--{city_code}"
     
-    output_file = "meetup_events.json"
+    if output_file is None:
+        output_file = os.path.join(os.path.dirname(os.path.abspath(__file__)), "meetup_events.json")
     
     # Build URL
     url = f"https://www.meetup.com/find/?location={location}&source=EVENTS"
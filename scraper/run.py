@@ -9,9 +9,16 @@ import asyncio
 import json
 import os
 import argparse
+import threading
 from datetime import datetime
-from typing import List, Dict
+from typing import List, Dict, Optional
 from config_loader import get_config
+
+# orjson is optional; it makes reading and writing the merged events file much faster
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 # Import working scrapers with correct module names
 from eventbrite_scraper import scrape_eventbrite
@@ -21,17 +28,91 @@ from dice_scraper import scrape_dice
 from posh_vip import scrape_posh_vip
 from ra_co import scrape_ra_co
 
+# Output files live next to the scrapers regardless of the caller's working directory
+SCRAPER_DIR = os.path.dirname(os.path.abspath(__file__))
+ALL_EVENTS_FILE = os.path.join(SCRAPER_DIR, 'all_events.json')
+
+# Serializes the read-merge-write of ALL_EVENTS_FILE across concurrent city runs
+_all_events_lock = threading.Lock()
+
+# Each city keeps its own per-source output files, so concurrent city runs
+# never read or rewrite each other's history
+CITY_OUTPUT_DIR = os.path.join(SCRAPER_DIR, 'cities')
+
+
+def _city_output_file(location: str, filename: str) -> str:
+    """Path of a scraper's output file for one city"""
+    city_dir = os.path.join(CITY_OUTPUT_DIR, os.path.basename(location))
+    os.makedirs(city_dir, exist_ok=True)
+    return os.path.join(city_dir, filename)
+
 
+def _read_json(path: str):
+    """Load a JSON file, using orjson when available"""
+    if orjson is not None:
+        with open(path, 'rb') as f:
+            return orjson.loads(f.read())
+    with open(path, 'r') as f:
+        return json.load(f)
+
+
+def _write_json(path: str, payload) -> None:
+    """Write payload as indented JSON, using orjson when available"""
+    if orjson is not None:
+        # Pass datetimes through to default=str so output matches the json module
+        data = orjson.dumps(
+            payload,
+            default=str,
+            option=orjson.OPT_INDENT_2 | orjson.OPT_PASSTHROUGH_DATETIME
+        )
+        with open(path, 'wb') as f:
+            f.write(data)
+        return
+    with open(path, 'w') as f:
+        json.dump(payload, f, indent=2, default=str)
+
+
 def _write_frontend_cache(payload: dict) -> None:
     frontend_public = os.path.join(os.path.dirname(__file__), '../fronto/public')
     os.makedirs(frontend_public, exist_ok=True)
     frontend_path = os.path.join(frontend_public, 'all_events.json')
-    with open(frontend_path, 'w') as f:
-        json.dump(payload, f, indent=2, default=str)
+    _write_json(frontend_path, payload)
+
+
+def _merge_into_all_events(location: str, unique_events: List[Dict], scraper_results: Dict) -> None:
+    """Replace one city's events in ALL_EVENTS_FILE and refresh the frontend cache"""
+    with _all_events_lock:
+        # Missing or unreadable file just means there is nothing to merge yet
+        try:
+            existing_by_city = _read_json(ALL_EVENTS_FILE).get('events_by_city', {}) or {}
+        except Exception:
+            existing_by_city = {}
+
+        existing_by_city[location] = unique_events
+        merged_events = []
+        for city_events in existing_by_city.values():
+            merged_events.extend(city_events)
+
+        payload = {
+            'events': merged_events,
+            'total': len(merged_events),
+            'location': location,
+            'events_by_city': existing_by_city,
+            'timestamp': datetime.now().isoformat(),
+            'sources': scraper_results
+        }
+        _write_json(ALL_EVENTS_FILE, payload)
+        _write_frontend_cache(payload)
 
 
-async def run_all_scrapers(location_override: str = None):
-    """Run all scrapers and merge results"""
+async def run_all_scrapers(location_override: str = None, event_queue: Optional[asyncio.Queue] = None):
+    """
+    Run all scrapers and merge results
+
+    If event_queue is given, each source's events are also put on it as soon
+    as that source finishes, so a consumer can process them while the
+    remaining sources are still being scraped.
+    """
     
     print("=" * 70)
     print("EVENT SCRAPER - All Sources")
@@ -53,8 +134,12 @@ async def run_all_scrapers(location_override: str = None):
         print("\n[1/5] Scraping Eventbrite...")
         print("-" * 70)
         try:
-            eventbrite_events = await scrape_eventbrite(location)
+            eventbrite_events = await scrape_eventbrite(
+                location, output_file=_city_output_file(location, 'eventbrite_events.json')
+            )
             all_events.extend(eventbrite_events)
+            if event_queue is not None:
+                await event_queue.put(eventbrite_events)
             scraper_results['Eventbrite'] = len(eventbrite_events)
             print(f"✓ Eventbrite: {len(eventbrite_events)} events")
         except Exception as e:
@@ -66,8 +151,12 @@ async def run_all_scrapers(location_override: str = None):
         print("\n[2/5] Scraping Meetup...")
         print("-" * 70)
         try:
-            meetup_events = await scrape_meetup(location)
+            meetup_events = await scrape_meetup(
+                location, output_file=_city_output_file(location, 'meetup_events.json')
+            )
             all_events.extend(meetup_events)
+            if event_queue is not None:
+                await event_queue.put(meetup_events)
             scraper_results['Meetup'] = len(meetup_events)
             print(f"✓ Meetup: {len(meetup_events)} events")
         except Exception as e:
@@ -79,8 +168,12 @@ async def run_all_scrapers(location_override: str = None):
         print("\n[3/5] Scraping Luma...")
         print("-" * 70)
         try:
-            luma_events = await scrape_luma(location)
+            luma_events = await scrape_luma(
+                location, output_file=_city_output_file(location, 'luma_events.json')
+            )
             all_events.extend(luma_events)
+            if event_queue is not None:
+                await event_queue.put(luma_events)
             scraper_results['Luma'] = len(luma_events)
             print(f"✓ Luma: {len(luma_events)} events")
         except Exception as e:
@@ -92,8 +185,12 @@ async def run_all_scrapers(location_override: str = None):
         print("\n[4/5] Scraping Dice.fm...")
         print("-" * 70)
         try:
-            dice_events = await scrape_dice(location)
+            dice_events = await scrape_dice(
+                location, output_file=_city_output_file(location, 'dice_events.json')
+            )
             all_events.extend(dice_events)
+            if event_queue is not None:
+                await event_queue.put(dice_events)
             scraper_results['Dice.fm'] = len(dice_events)
             print(f"✓ Dice.fm: {len(dice_events)} events")
         except Exception as e:
@@ -106,8 +203,14 @@ async def run_all_scrapers(location_override: str = None):
         print("-" * 70)
         try:
             ra_fetch = config.get_scraper_config('RA_CO').get('fetch_details', True)
-            ra_events = await scrape_ra_co(location, fetch_details=ra_fetch)
+            ra_events = await scrape_ra_co(
+                location,
+                output_file=_city_output_file(location, 'ra_co_events.json'),
+                fetch_details=ra_fetch
+            )
             all_events.extend(ra_events)
+            if event_queue is not None:
+                await event_queue.put(ra_events)
             scraper_results['RA.co'] = len(ra_events)
             print(f"✓ RA.co: {len(ra_events)} events")
         except Exception as e:
@@ -139,31 +242,9 @@ async def run_all_scrapers(location_override: str = None):
     output_settings = config.get_output_settings()
     
     if output_settings.get('MERGE_ALL', True):
-        existing_by_city = {}
-        if os.path.exists('all_events.json'):
-            try:
-                with open('all_events.json', 'r') as f:
-                    existing_data = json.load(f)
-                    existing_by_city = existing_data.get('events_by_city', {}) or {}
-            except Exception:
-                existing_by_city = {}
-
-        existing_by_city[location] = unique_events
-        merged_events = []
-        for city_events in existing_by_city.values():
-            merged_events.extend(city_events)
-
-        payload = {
-            'events': merged_events,
-            'total': len(merged_events),
-            'location': location,
-            'events_by_city': existing_by_city,
-            'timestamp': datetime.now().isoformat(),
-            'sources': scraper_results
-        }
-        with open('all_events.json', 'w') as f:
-            json.dump(payload, f, indent=2, default=str)
-        _write_frontend_cache(payload)
+        # The merged file spans every city and can be large; read and rewrite
+        # it off the event loop so other scrapes keep running meanwhile
+        await asyncio.to_thread(_merge_into_all_events, location, unique_events, scraper_results)
         
         print(f"✓ Saved {len(unique_events)} merged events to all_events.json")
     
@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+Tests for the plain-HTTP fetch and date parsing helpers in agentbrowse
+Run with: python -m pytest test_agentbrowse.py
+"""
+
+import asyncio
+from datetime import date, datetime, timedelta, timezone
+from email.utils import format_datetime
+
+import pytest
+from aiohttp import web
+
+import agentbrowse
+from agentbrowse import _parse_common_date
+
+
+@pytest.mark.parametrize("date_str", [
+    "12/05/2026",
+    "1/9/2026",
+    "02-28-2027",
+    "Dec 20, 2026",
+    "December 20, 2026",
+    "Sat, Dec 19, 2026",
+    "Saturday, December 19, 2026",
+    "sat, dec 19, 2026",
+    "Sept 3, 2026",
+    "Feb 29, 2028",
+])
+def test_parse_common_date_matches_strptime(date_str):
+    # Same shapes _parse_event_date would otherwise hand to strptime
+    expected = None
+    for pattern in ("%m/%d/%Y", "%m-%d-%Y", "%b %d, %Y", "%B %d, %Y", "%a, %b %d, %Y", "%A, %B %d, %Y"):
+        try:
+            expected = datetime.strptime(date_str, pattern).date()
+            break
+        except ValueError:
+            continue
+
+    assert _parse_common_date(date_str) == expected
+
+
+@pytest.mark.parametrize("date_str", [
+    "Feb 30, 2026",
+    "13/01/2026",
+    "12/05-2026",
+    "Foo, Dec 20, 2026",
+    "Smarch 3, 2026",
+    "Dec 20",
+    "Tomorrow",
+    "",
+])
+def test_parse_common_date_rejects_invalid(date_str):
+    assert _parse_common_date(date_str) is None
+
+
+def test_parse_event_date_uses_fast_path():
+    assert agentbrowse._parse_event_date("Sat, Dec 19, 2026 (PST)", date(2026, 1, 1)) == date(2026, 12, 19)
+
+
+@pytest.mark.parametrize("retry_after, expected", [
+    ("5", 5.0),
+    ("0", 0.0),
+    ("-3", 0.0),
+    ("3600", agentbrowse.HTTP_MAX_RETRY_DELAY),
+])
+def test_retry_delay_honors_retry_after_seconds(retry_after, expected):
+    assert agentbrowse._retry_delay(retry_after, 1) == expected
+
+
+def test_retry_delay_honors_retry_after_http_date():
+    when = datetime.now(timezone.utc) + timedelta(seconds=10)
+
+    assert 8 <= agentbrowse._retry_delay(format_datetime(when, usegmt=True), 1) <= 10
+
+
+@pytest.mark.parametrize("retry_after", [None, "", "soon"])
+def test_retry_delay_falls_back_to_backoff(retry_after):
+    assert 1 <= agentbrowse._retry_delay(retry_after, 1) < 2
+    assert 4 <= agentbrowse._retry_delay(retry_after, 3) < 5
+
+
+def _fetch(responses, monkeypatch):
+    """
+    Run fetch_html against a local server replying with responses in order.
+    Returns (html, number of requests served, delays slept between attempts).
+    """
+    served = []
+    delays = []
+
+    async def handler(request):
+        status, headers, body = responses[min(len(served), len(responses) - 1)]
+        served.append(request.path)
+        return web.Response(status=status, headers=headers, text=body, content_type="text/html")
+
+    class RecordingAsyncio:
+        """agentbrowse's view of asyncio, with retry pauses recorded instead of slept"""
+
+        def __getattr__(self, name):
+            return getattr(asyncio, name)
+
+        @staticmethod
+        async def sleep(seconds):
+            delays.append(seconds)
+
+    monkeypatch.setattr(agentbrowse, "asyncio", RecordingAsyncio())
+
+    async def run():
+        app = web.Application()
+        app.router.add_get("/page", handler)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        site = web.TCPSite(runner, "127.0.0.1", 0)
+        await site.start()
+        port = runner.addresses[0][1]
+        try:
+            async with agentbrowse.new_http_session() as session:
+                return await agentbrowse.fetch_html(f"http://127.0.0.1:{port}/page", session)
+        finally:
+            await runner.cleanup()
+
+    html = asyncio.run(run())
+    return html, len(served), delays
+
+
+def test_fetch_html_returns_page(monkeypatch):
+    html, served, delays = _fetch([(200, {}, "<html>ok</html>")], monkeypatch)
+
+    assert html == "<html>ok</html>"
+    assert served == 1
+    assert delays == []
+
+
+def test_fetch_html_retries_with_retry_after(monkeypatch):
+    responses = [
+        (429, {"Retry-After": "7"}, "slow down"),
+        (503, {}, "unavailable"),
+        (200, {}, "<html>ok</html>"),
+    ]
+
+    html, served, delays = _fetch(responses, monkeypatch)
+
+    assert html == "<html>ok</html>"
+    assert served == 3
+    assert delays[0] == 7.0
+    assert 2 <= delays[1] < 3
+
+
+def test_fetch_html_gives_up_after_max_attempts(monkeypatch):
+    html, served, delays = _fetch([(503, {"Retry-After": "1"}, "down")], monkeypatch)
+
+    assert html is None
+    assert served == agentbrowse.HTTP_FETCH_ATTEMPTS
+    assert delays == [1.0] * (agentbrowse.HTTP_FETCH_ATTEMPTS - 1)
+
+
+def test_fetch_html_does_not_retry_client_errors(monkeypatch):
+    html, served, delays = _fetch([(404, {}, "missing")], monkeypatch)
+
+    assert html is None
+    assert served == 1
+    assert delays == []
+
+
+def test_fetch_html_rejects_bot_challenge(monkeypatch):
+    body = '<html><script src="/cdn-cgi/challenge-platform/x.js"></script></html>'
+
+    html, served, _ = _fetch([(200, {}, body)], monkeypatch)
+
+    assert html is None
+    assert served == 1